@@ -0,0 +1,58 @@
+"""
+per-guess cost of the Evil word picker. for each word length, plays rounds against hangman_solver.Adversary with the
+frequency guesser and reports how long respond() (partitioning every remaining candidate by pattern family) takes.
+the first guess of a round partitions the whole length bucket, so that's the worst case.
+
+needs NumPy and a hangman_dictionary index. run from the repo root:
+    python -m benchmarks.bench_adversary --dictionary words.idx
+"""
+import argparse
+import time
+
+import hangman_dictionary
+import hangman_engine
+import hangman_solver
+from benchmarks.bench_engine import FREQUENCY_ORDER
+
+def play_round(solver, length, guesses):
+    """
+    - one round against a fresh adversary. returns (first guess seconds, every guess's seconds, won)
+    """
+    adversary = hangman_solver.Adversary(solver, length)
+    state = hangman_engine.open_state(length, guesses)
+    times = []
+    for letter in FREQUENCY_ORDER:
+        if state.over:
+            break
+        start = time.perf_counter()
+        positions = adversary.respond(letter)
+        times.append(time.perf_counter() - start)
+        hangman_engine.commit(state, letter, positions)
+        hangman_engine.guess(state, letter)
+    return times[0], times, state.won
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="adversary partition cost per guess")
+    parser.add_argument("--dictionary", default=hangman_dictionary.DICTIONARY_PATH)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--guesses", type=int, default=hangman_engine.MAX_GUESSES)
+    args = parser.parse_args(argv)
+
+    dictionary = hangman_dictionary.Dictionary(args.dictionary) #not closed: the solver's matrices are views of its mapping
+    solver = hangman_solver.Solver(dictionary)
+    print("  length    words  first guess (ms)  mean guess (ms)  guesser wins")
+    for length in dictionary.lengths():
+        if length > hangman_solver.MAX_SIGNATURE_LENGTH:
+            continue
+        solver.matrix(length) #building the matrix isn't part of a guess
+        firsts, times, wins = [], [], 0
+        for i in range(args.rounds):
+            first, round_times, won = play_round(solver, length, args.guesses)
+            firsts.append(first)
+            times += round_times
+            wins += won
+        print("  %6d  %7d  %16.2f  %15.2f  %12d" % (length, dictionary.count(length), max(firsts) * 1000,
+                                                 sum(times) / len(times) * 1000, wins))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+word validation cost per character, for every hangman_alphabets alphabet, against the check the pages used to do:
+uppercase the entry, then test each letter with `letter not in alphabet.get()` (a Tcl variable fetched per letter,
+then a substring search of the whole alphabet string).
+
+columns, in nanoseconds per character:
+- tcl var:   the old check against a Tcl StringVar holding the alphabet (skipped if tkinter can't start Tcl)
+- str:       the same substring search on a plain Python string, without the Tcl fetch
+- frozenset: Alphabet.validate_word() on already-normalized words
+- normalize: Alphabet.normalize() (the translate table: case, accents, script variants) plus validate_word()
+
+run from the repo root:
+    python -m benchmarks.bench_alphabet
+"""
+import argparse
+import random
+import time
+
+import hangman_alphabets
+
+def random_words(letters, count, rng):
+    return ["".join(rng.choices(letters, k=rng.randint(4, 12))) for i in range(count)]
+
+def old_check(word, get):
+    for letter in word.upper():
+        if letter not in get():
+            return "Your word can only contain letters"
+    return None
+
+def per_char(func, words, rounds):
+    chars = sum(len(word) for word in words) * rounds
+    start = time.perf_counter()
+    for i in range(rounds):
+        for word in words:
+            func(word)
+    return (time.perf_counter() - start) / chars * 1e9
+
+def tcl_getter(letters):
+    """
+    - alphabet.get for a Tcl StringVar holding letters, or None if there's no Tcl to run it in
+    """
+    try:
+        import tkinter
+        interpreter = tkinter.Tcl()
+    except Exception:
+        return None
+    return tkinter.StringVar(interpreter, value=letters).get
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="alphabet validation cost per character")
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print("%-10s %7s  %8s  %8s  %9s  %9s" % ("alphabet", "letters", "tcl var", "str", "frozenset", "normalize"))
+    for name in hangman_alphabets.names():
+        alphabet = hangman_alphabets.get(name)
+        words = random_words(alphabet.letters, args.words, rng)
+        typed = [word.lower() for word in words] #what the player types; normalize() maps it back
+
+        get = tcl_getter(alphabet.letters)
+        tcl = "%8.0f" % per_char(lambda word: old_check(word, get), words, args.rounds) if get else "%8s" % "-"
+        letters = alphabet.letters
+        plain = per_char(lambda word: old_check(word, lambda: letters), words, args.rounds)
+        frozen = per_char(alphabet.validate_word, words, args.rounds)
+        normalized = per_char(lambda word: alphabet.validate_word(alphabet.normalize(word)), typed, args.rounds)
+        print("%-10s %7d  %s  %8.0f  %9.0f  %9.0f" % (name, len(letters), tcl, plain, frozen, normalized))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+throughput benchmark for hangman_engine. plays simulated rounds with a fixed letter-frequency guesser and reports games per second.
+
+run from the repo root:
+    python -m benchmarks.bench_engine --games 200000
+    python -m benchmarks.bench_engine --words words.txt
+"""
+import argparse
+import random
+import time
+
+import hangman_engine
+
+FREQUENCY_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+def frequency_guesser(state):
+    """
+    - guesses the most common English letter that hasn't been tried yet
+    """
+    guessed = state.guessed
+    bits = state.bits
+    for letter in FREQUENCY_ORDER:
+        if not guessed & bits[letter]:
+            return letter
+
+def random_words(count, seed):
+    rng = random.Random(seed)
+    return ["".join(rng.choices(hangman_engine.ALPHABET, k=rng.randint(4, 12))) for i in range(count)]
+
+def run(words, games, guesses_left):
+    """
+    - plays games rounds cycling through words. returns (seconds, wins).
+    """
+    play = hangman_engine.play
+    wins = 0
+    count = len(words)
+    start = time.perf_counter()
+    for i in range(games):
+        if play(words[i % count], guesses_left, frequency_guesser).won:
+            wins += 1
+    return time.perf_counter() - start, wins
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", help="word list, one word per line (random words if omitted)")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--guesses", type=int, default=hangman_engine.MIN_GUESSES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    words = hangman_engine.read_word_list(args.words) if args.words else random_words(10000, args.seed)
+    seconds, wins = run(words, args.games, args.guesses)
+    print("games:      %d" % args.games)
+    print("seconds:    %.3f" % seconds)
+    print("games/sec:  %.0f" % (args.games / seconds))
+    print("win rate:   %.3f" % (wins / args.games))
+
+if __name__ == "__main__":
+    main()
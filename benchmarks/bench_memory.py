@@ -0,0 +1,44 @@
+"""
+memory cost of live games. builds many hangman_engine.Match objects, each mid-round with a GameState and a few
+guesses made, and reports the bytes tracemalloc attributes to each one.
+
+run from the repo root:
+    python -m benchmarks.bench_memory --games 100000
+"""
+import argparse
+import random
+import tracemalloc
+
+import hangman_engine
+from benchmarks.bench_engine import FREQUENCY_ORDER, random_words
+
+def make_match(word, guesses_made):
+    match = hangman_engine.Match("Player 1", "Player 2")
+    match.word_picker, match.word_guesser = match.player_one, match.player_two
+    match.game = hangman_engine.GameState(word, match.guesses)
+    for letter in FREQUENCY_ORDER[:guesses_made]:
+        if match.game.over:
+            break
+        hangman_engine.guess(match.game, letter)
+    return match
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="bytes per live hangman game")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--guesses-made", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    words = random_words(args.games, args.seed)
+    rng = random.Random(args.seed)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    matches = [make_match(word, rng.randint(0, args.guesses_made)) for word in words]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print("games:          %d" % len(matches))
+    print("bytes per game: %.0f (Match + GameState + lists, words excluded)" % ((after - before) / len(matches)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+phrase-mode guess latency. times hangman_engine.guess() on targets from 10 to 10,000 characters, plus the one
+" ".join() that GamePage.refresh_display() does per idle batch. guess latency should stay flat as the target grows.
+
+run from the repo root:
+    python -m benchmarks.bench_phrase
+"""
+import argparse
+import random
+import time
+
+import hangman_engine
+
+def make_phrase(length, rng):
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append("".join(rng.choices(hangman_engine.ALPHABET, k=rng.randint(2, 9))) + rng.choice(("", "", ",", ".")))
+    return hangman_engine.normalize_phrase(" ".join(words))[:length]
+
+def time_guesses(phrase, rounds):
+    """
+    - mean seconds per guess() over rounds full games (every letter guessed once)
+    """
+    total, guesses = 0.0, 0
+    for i in range(rounds):
+        state = hangman_engine.GameState(phrase, len(hangman_engine.ALPHABET))
+        for letter in hangman_engine.ALPHABET:
+            start = time.perf_counter()
+            hangman_engine.guess(state, letter)
+            total += time.perf_counter() - start
+            guesses += 1
+    return total / guesses
+
+def time_render(phrase, rounds):
+    blank = hangman_engine.GameState(phrase, 5).blank
+    start = time.perf_counter()
+    for i in range(rounds):
+        " ".join(blank)
+    return (time.perf_counter() - start) / rounds
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="phrase-mode guess latency by target length")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print("  length  guess (us)  render (us)")
+    for length in (10, 100, 1000, 10000):
+        phrase = make_phrase(length, rng)
+        print("  %6d  %10.2f  %11.2f" % (length, time_guesses(phrase, args.rounds) * 1e6, time_render(phrase, args.rounds) * 1e6))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+load generator for hangman_server. opens many simulated sessions at once against a local server. each session
+uses two connections, a picker and a guesser, and plays a full round. reports sessions per second, guess latency
+percentiles (from sending a guess to the guesser receiving its result), and with --spawn, sessions per server CPU second.
+
+every session needs two sockets, so raise the open-file limit (ulimit -n) for large runs.
+
+run from the repo root:
+    python -m benchmarks.bench_server --spawn --sessions 10000
+    python -m benchmarks.bench_server --port 8765 --sessions 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import hangman_engine
+from benchmarks.bench_engine import FREQUENCY_ORDER, random_words
+
+async def read_until(reader, op):
+    while True:
+        message = json.loads(await reader.readline())
+        if message["op"] == op:
+            return message
+        if message["op"] in ("error", "left"):
+            raise RuntimeError(message)
+
+def send(writer, message):
+    writer.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+
+async def play_session(host, port, word, guesses, latencies):
+    picker_reader, picker = await asyncio.open_connection(host, port)
+    guesser_reader, guesser = await asyncio.open_connection(host, port)
+    try:
+        send(picker, {"op": "new", "name": "picker", "guesses": guesses})
+        session = await read_until(picker_reader, "session")
+        send(guesser, {"op": "join", "id": session["id"], "name": "guesser"})
+        await read_until(picker_reader, "joined")
+        send(picker, {"op": "word", "word": word})
+        await read_until(guesser_reader, "start")
+
+        for letter in FREQUENCY_ORDER:
+            start = time.perf_counter()
+            send(guesser, {"op": "guess", "letter": letter})
+            result = await read_until(guesser_reader, "result")
+            latencies.append(time.perf_counter() - start)
+            if result["guesses_left"] == 0 or "_" not in result["blank"]:
+                break
+    finally:
+        picker.close()
+        guesser.close()
+
+def cpu_seconds(pid):
+    """
+    - user + system CPU time of a running process, from /proc (Linux only). None elsewhere.
+    """
+    try:
+        with open("/proc/%d/stat" % pid) as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def raise_file_limit():
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+async def run(host, port, sessions, guesses, concurrency, seed):
+    words = random_words(sessions, seed)
+    latencies = []
+    limit = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one(word):
+        nonlocal failures
+        async with limit:
+            try:
+                await play_session(host, port, word, guesses, latencies)
+            except (OSError, RuntimeError, ValueError):
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(word) for word in words))
+    return time.perf_counter() - start, latencies, failures
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="simulate many hangman_server sessions against localhost")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=10000, help="sessions open at the same time")
+    parser.add_argument("--guesses", type=int, default=hangman_engine.MIN_GUESSES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="start a server subprocess for the run")
+    args = parser.parse_args(argv)
+
+    raise_file_limit()
+    server = None
+    if args.spawn:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        server = subprocess.Popen([sys.executable, os.path.join(root, "hangman_server.py"), "--host", args.host, "--port", str(args.port)])
+        time.sleep(0.5) #give it time to bind
+    try:
+        cpu_before = cpu_seconds(server.pid) if server else None
+        seconds, latencies, failures = asyncio.run(run(args.host, args.port, args.sessions, args.guesses, args.concurrency, args.seed))
+        cpu_after = cpu_seconds(server.pid) if server else None
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    completed = args.sessions - failures
+    print("sessions:         %d (%d failed)" % (completed, failures))
+    print("seconds:          %.3f" % seconds)
+    print("sessions/sec:     %.0f" % (completed / seconds))
+    if cpu_before is not None and cpu_after is not None and cpu_after > cpu_before:
+        print("sessions/cpu-sec: %.0f (server process)" % (completed / (cpu_after - cpu_before)))
+    if latencies:
+        print("guess latency:    p50 %.2f ms  p99 %.2f ms  mean %.2f ms" % (
+            percentile(latencies, 0.50) * 1000, percentile(latencies, 0.99) * 1000, statistics.mean(latencies) * 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+startup benchmark for hangman_game_ui. every sample is a fresh interpreter, so nothing is cached between runs.
+
+reports:
+- import time: importing hangman_game_ui (no window is created on import)
+- first frame: from process start until StartPage is mapped on screen
+
+needs a display (or a virtual X server such as Xvfb). run from the repo root:
+    python -m benchmarks.bench_startup --runs 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_CHILD = """
+import time
+start = time.perf_counter()
+import hangman_game_ui
+print(time.perf_counter() - start)
+"""
+
+FRAME_CHILD = """
+import os, time
+import hangman_game_ui
+root = hangman_game_ui.WindowMain()
+frame = root.frames[hangman_game_ui.StartPage]
+while not frame.winfo_viewable():
+    root.update()
+print(time.time() - float(os.environ["HANGMAN_BENCH_START"]))
+root.destroy()
+"""
+
+def run_child(code, env=None):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "child failed")
+    return float(result.stdout.strip().splitlines()[-1])
+
+def sample_import():
+    return run_child(IMPORT_CHILD)
+
+def sample_first_frame():
+    env = dict(os.environ)
+    env["HANGMAN_BENCH_START"] = repr(time.time()) #taken just before the process is spawned
+    return run_child(FRAME_CHILD, env)
+
+def report(name, samples):
+    samples = [sample * 1000 for sample in samples]
+    print("%-12s median %7.1f ms   min %7.1f ms   max %7.1f ms" % (name, statistics.median(samples), min(samples), max(samples)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="time hangman_game_ui import and first frame")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    report("import", [sample_import() for i in range(args.runs)])
+    try:
+        report("first frame", [sample_first_frame() for i in range(args.runs)])
+    except RuntimeError as error:
+        print("first frame  skipped: %s" % error)
+
+if __name__ == "__main__":
+    main()
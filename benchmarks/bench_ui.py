@@ -0,0 +1,235 @@
+"""
+end-to-end UI benchmark. builds a real WindowMain, on a private Xvfb server unless --display is given, and plays
+full games with synthetic events from event_generate: click Play, type both names, click the word picker radio
+button, type the word, then type and submit guesses until the game ends.
+
+every measured step is one keypress or click: the time from event_generate() until update_idletasks() returns, by which point
+the handler has run, any after_idle refresh has .set() its labels and Tk has redrawn. samples are grouped by page and
+by what the key did (typing into an entry, or the <Return>/space that runs a handler and changes page), so
+check_player_guess, var_refresh (behind Play) and each page transition have their own rows. HANGMAN_PROFILE is
+turned on for the run too, and its per-handler times (the callback alone, without the redraw) are reported alongside.
+
+the first --warmup games aren't counted. with --save the medians are written as a baseline, and with --baseline a
+later run fails (exit status 1) if any median got slower than the tolerance allows, so a regression is caught
+automatically.
+
+run from the repo root:
+    python -m benchmarks.bench_ui --games 30 --save ui_baseline.json
+    python -m benchmarks.bench_ui --games 30 --baseline ui_baseline.json
+"""
+import argparse
+import gc
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_engine import FREQUENCY_ORDER, random_words
+
+def start_xvfb(screen="800x600x24"):
+    """
+    - starts Xvfb on a free display number and points DISPLAY at it. returns the process, to be killed when done.
+    """
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise SystemExit("no Xvfb on PATH; install it or pass --display to use an existing X server")
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen([xvfb, "-displayfd", str(write_fd), "-screen", "0", screen, "-nolisten", "tcp"],
+                               pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip() #Xvfb writes the display number here once it's accepting connections
+    if not number:
+        process.kill()
+        raise SystemExit("Xvfb did not start")
+    os.environ["DISPLAY"] = ":" + number
+    return process
+
+def find(frame, widget_class, option, value):
+    """
+    - the child of frame with that Tk class whose option equals value (pages keep most widgets in locals)
+    """
+    for child in frame.winfo_children():
+        if child.winfo_class() == widget_class and str(child.cget(option)) == str(value):
+            return child
+    raise LookupError("no %s with %s=%r" % (widget_class, option, value))
+
+class Driver:
+    """
+    plays games on a WindowMain through event_generate and records one sample per measured keypress
+    """
+    def __init__(self, root, ui):
+        self.root = root
+        self.ui = ui
+        self.samples = dict()
+        self.recording = False
+
+    def press(self, widget, category, **event):
+        """
+        - sends one key to widget and waits until Tk is idle again. records the seconds it took under category
+        (unless category is None) and returns them.
+        """
+        root = self.root
+        start = time.perf_counter()
+        widget.event_generate("<KeyPress>", **event)
+        root.update_idletasks()
+        seconds = time.perf_counter() - start
+        if category is not None:
+            self.record(category, seconds)
+        return seconds
+
+    def click(self, widget, category):
+        """
+        - clicks a ttk button or radio button. only the release is timed, since that's when ttk invokes it.
+        (space would work too, but ttk's keyboard activation sleeps 100ms to show the pressed state.)
+        """
+        widget.event_generate("<ButtonPress-1>", x=2, y=2)
+        root = self.root
+        start = time.perf_counter()
+        widget.event_generate("<ButtonRelease-1>", x=2, y=2)
+        root.update_idletasks()
+        self.record(category, time.perf_counter() - start)
+
+    def record(self, category, seconds):
+        if self.recording:
+            self.samples.setdefault(category, []).append(seconds)
+
+    def focus(self, widget):
+        widget.focus_force()
+        self.root.update() #key events go to the focus widget, so let the focus change land first
+
+    def type_into(self, entry, text, page):
+        self.focus(entry)
+        entry.delete(0, "end")
+        for char in text:
+            self.press(entry, page + " typing", keysym="space" if char == " " else char)
+
+    def page(self, page):
+        return self.root.frames[page]
+
+    def play_game(self, word):
+        ui = self.ui
+
+        start = self.page(ui.StartPage)
+        self.click(find(start, "TButton", "text", "Play Hangman"), "StartPage play -> SettingsPage (var_refresh)")
+
+        settings = self.page(ui.SettingsPage)
+        self.type_into(find(settings, "TEntry", "textvariable", settings.player_one_name), "Ann", "SettingsPage")
+        self.type_into(find(settings, "TEntry", "textvariable", settings.player_two_name), "Bob", "SettingsPage")
+        radio = find(settings, "TRadiobutton", "value", "Player 1")
+        self.click(radio, "SettingsPage radio")
+        self.focus(radio)
+        self.press(radio, "SettingsPage update_Word_Picker -> WordPage", keysym="Return")
+
+        word_page = self.page(ui.WordPage)
+        self.type_into(word_page.enter_word_entry, word.lower(), "WordPage")
+        self.press(word_page.enter_word_entry, "WordPage WordPage_func -> GamePage", keysym="Return")
+
+        game_page = self.page(ui.GamePage)
+        entry = game_page.player_guess_entry
+        self.focus(entry)
+        for letter in FREQUENCY_ORDER:
+            self.press(entry, "GamePage typing", keysym=letter.lower())
+            seconds = self.press(entry, None, keysym="Return")
+            if self.root.match.game.over:
+                self.record("GamePage GamePage_func -> StartPage (gameover)", seconds)
+                break
+            self.record("GamePage GamePage_func", seconds)
+        if self.root.current_page is not ui.StartPage:
+            raise RuntimeError("game for %r did not end on StartPage" % word)
+        expected = " ".join(self.root.match.game.blank)
+        if game_page.word_blank.get() != expected:
+            raise RuntimeError("word blank label out of date: %r != %r" % (game_page.word_blank.get(), expected))
+
+def summarize(samples):
+    report = dict()
+    for category, values in sorted(samples.items()):
+        values = sorted(values)
+        report[category] = {"count": len(values), "median_ms": statistics.median(values) * 1000,
+                            "p90_ms": values[min(len(values) - 1, int(0.9 * len(values)))] * 1000,
+                            "max_ms": values[-1] * 1000}
+    return report
+
+def print_report(report, handlers):
+    print("%-50s %6s %10s %8s %8s" % ("keypress -> labels updated", "count", "median ms", "p90 ms", "max ms"))
+    for category, row in report.items():
+        print("%-50s %6d %10.3f %8.3f %8.3f" % (category, row["count"], row["median_ms"], row["p90_ms"], row["max_ms"]))
+    print("\n%-50s %6s %10s %8s" % ("inside the callback (hangman_profile)", "count", "p50 ms", "p99 ms"))
+    for name, row in handlers.items():
+        if row["count"] and name != "event_loop_lag":
+            print("%-50s %6d %10.3f %8.3f" % (name, row["count"], row["p50_ms"], row["p99_ms"]))
+
+def compare(report, baseline, tolerance, floor_ms):
+    """
+    - rows whose median got slower than baseline * (1 + tolerance), ignoring differences under floor_ms (timer noise)
+    """
+    slower = []
+    for category, row in report.items():
+        before = baseline.get(category)
+        if before is None:
+            continue
+        limit = max(before["median_ms"] * (1 + tolerance), before["median_ms"] + floor_ms)
+        if row["median_ms"] > limit:
+            slower.append((category, before["median_ms"], row["median_ms"]))
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="keypress-to-label latency of full games under a virtual X server")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--display", help="use this X display instead of starting Xvfb")
+    parser.add_argument("--save", help="write this run's report as a baseline (JSON)")
+    parser.add_argument("--baseline", help="fail if any median is slower than in this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown as a fraction of the baseline median")
+    parser.add_argument("--floor-ms", type=float, default=0.2, help="slowdowns smaller than this are never flagged")
+    args = parser.parse_args(argv)
+
+    xvfb = None
+    if args.display:
+        os.environ["DISPLAY"] = args.display
+    else:
+        xvfb = start_xvfb()
+    profile = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+    profile.close()
+    os.environ["HANGMAN_PROFILE"] = profile.name #instrument the handlers too; the export on destroy goes to a temp file
+
+    try:
+        import hangman_game_ui as ui
+        root = ui.WindowMain()
+        root.recording = False #keep benchmark games out of the stats database and game log
+        root.update()
+        driver = Driver(root, ui)
+        words = random_words(args.games + args.warmup, args.seed)
+        for i, word in enumerate(words):
+            driver.recording = i >= args.warmup
+            gc.collect() #start each game from the same heap state, so a collection doesn't land on one game's keypress
+            driver.play_game(word)
+        handlers = root.profiler.summary()
+        root.destroy()
+    finally:
+        os.unlink(profile.name)
+        if xvfb is not None:
+            xvfb.kill()
+            xvfb.wait()
+
+    report = summarize(driver.samples)
+    print_report(report, handlers)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = compare(report, json.load(f), args.tolerance, args.floor_ms)
+        for category, before, after in slower:
+            print("REGRESSION %s: median %.3f ms -> %.3f ms" % (category, before, after))
+        if slower:
+            sys.exit(1)
+        print("\nno regressions against %s" % args.baseline)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+alphabets the game can be played in. each one is built once, on first use, into:
+- letters: the guessable letters in display order, and letter_set, a frozenset of them for validation
+- bits: letter -> bit for the GameState guessed bitmask (see hangman_engine.letter_bits)
+- table: a str.translate() table mapping every other way of typing a letter (lowercase, accented, hiragana for
+  katakana...) to the canonical letter
+
+normalize() is NFC composition plus one str.translate() call, and membership is a frozenset lookup, so both cost
+O(1) per character however large the alphabet is: 26 letters or 11,172 Hangul syllables.
+
+more alphabets can be added with register(), from outside this module too.
+"""
+import unicodedata
+
+import hangman_engine
+
+DEFAULT = "english"
+
+def code_range(first, last):
+    return "".join(chr(code) for code in range(first, last + 1))
+
+#characters worth folding in each script: Latin-1 Supplement through Latin Extended-B, Latin Extended Additional,
+#and Greek with its polytonic block
+LATIN_FOLDS = code_range(0xC0, 0x24F) + code_range(0x1E00, 0x1EFF)
+GREEK_FOLDS = code_range(0x370, 0x3FF) + code_range(0x1F00, 0x1FFF)
+KANA_FOLDS = code_range(0x3041, 0x3096) + code_range(0xFF66, 0xFF9D) #hiragana and halfwidth katakana
+COMBINING_MARKS = code_range(0x300, 0x36F) #left over after NFC when a letter has no precomposed accented form
+
+def strip_accents(char):
+    """
+    - uppercase char without its combining marks: é -> E, ά -> Α, ß -> SS
+    """
+    return "".join(c for c in unicodedata.normalize("NFD", char) if not unicodedata.combining(c)).upper()
+
+def fold_kana(char):
+    """
+    - hiragana to the matching katakana, halfwidth katakana to fullwidth
+    """
+    if "ぁ" <= char <= "ゖ":
+        return chr(ord(char) + 0x60)
+    return unicodedata.normalize("NFKC", char)
+
+class Alphabet:
+    __slots__ = ("name", "letters", "letter_set", "bits", "table")
+
+    def __init__(self, name, letters, fold_chars="", fold=None, drop_chars=""):
+        self.name = name
+        self.letters = letters
+        self.letter_set = frozenset(letters)
+        self.bits = hangman_engine.LETTER_BITS if letters == hangman_engine.ALPHABET else hangman_engine.letter_bits(letters)
+        self.table = build_table(letters, self.letter_set, fold_chars, fold, drop_chars)
+
+    def normalize(self, text):
+        """
+        - composes decomposed input first (macOS and pasted text are often NFD: E + U+0301, or Hangul jamo), then translates
+        """
+        return unicodedata.normalize("NFC", text).translate(self.table)
+
+    def validate_word(self, word):
+        return hangman_engine.validate_word(word, self.letter_set)
+
+    def validate_phrase(self, phrase):
+        return hangman_engine.validate_phrase(phrase, self.letter_set)
+
+    def normalize_phrase(self, text):
+        """
+        - normalize() plus hangman_engine.normalize_phrase()'s whitespace collapsing
+        """
+        return " ".join(self.normalize(text).split())
+
+def build_table(letters, letter_set, fold_chars, fold, drop_chars=""):
+    """
+    - the translate table for an alphabet. case variants of every letter first, then fold(char) for each of
+    fold_chars that isn't a letter already, kept only when every character it folds to is a letter. drop_chars
+    that aren't letters are deleted.
+    """
+    table = dict.fromkeys(ord(char) for char in drop_chars if char not in letter_set)
+    for letter in letters:
+        for variant in (letter.lower(), letter.casefold(), letter.swapcase()):
+            if len(variant) == 1 and variant not in letter_set:
+                table.setdefault(ord(variant), letter)
+    if fold is not None:
+        for char in fold_chars:
+            if char in letter_set or ord(char) in table:
+                continue
+            folded = fold(char)
+            if folded and folded != char and all(c in letter_set for c in folded):
+                table[ord(char)] = folded
+    return table
+
+#name -> (letters, fold_chars, fold, drop_chars). built into Alphabets by get()
+SPECS = {
+    "english": (hangman_engine.ALPHABET, LATIN_FOLDS, strip_accents, COMBINING_MARKS),
+    "latin": (hangman_engine.ALPHABET + "ÀÁÂÃÄÅÆÇÈÉÊËÌÍÎÏÑÒÓÔÕÖØÙÚÛÜÝŸŒ", LATIN_FOLDS, strip_accents, ""),
+    "cyrillic": ("АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ", "", None, ""),
+    "greek": ("ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ", GREEK_FOLDS, strip_accents, ""),
+    "katakana": (code_range(0x30A1, 0x30F6) + "ー", KANA_FOLDS, fold_kana, ""), #ー, the long vowel mark, is spelled like a letter
+    "hangul": (code_range(0xAC00, 0xD7A3), "", None, ""), #every precomposed syllable
+}
+
+built = dict()
+
+def register(name, letters, fold_chars="", fold=None, drop_chars=""):
+    """
+    - adds an alphabet, or replaces one. it's built the first time get() asks for it.
+    """
+    SPECS[name] = (letters, fold_chars, fold, drop_chars)
+    built.pop(name, None)
+
+def names():
+    return tuple(SPECS)
+
+def get(name=DEFAULT):
+    """
+    - the Alphabet called name, built on the first call and shared after that. raises KeyError for an unknown name.
+    """
+    alphabet = built.get(name)
+    if alphabet is None:
+        alphabet = built[name] = Alphabet(name, *SPECS[name])
+    return alphabet
@@ -0,0 +1,98 @@
+"""
+thin client for hangman_server, made to sit next to the Tk pages without blocking mainloop.
+
+connecting, reading and writing all happen on background threads. incoming messages wait in a queue, and poll()
+drains it from the Tk thread with widget.after(), so on_message always runs on the UI thread. the Tk game's Network
+option plays through one of these (WindowMain.connect), which hands each message to the page being shown.
+
+    client = Client(root, on_message)
+    client.connect("127.0.0.1", 8765)
+    client.send({"op": "new", "name": "Player 1", "guesses": 5})
+"""
+import json
+import queue
+import socket
+import threading
+
+class Client:
+    def __init__(self, widget, on_message, poll_ms=20):
+        self.widget = widget
+        self.on_message = on_message
+        self.poll_ms = poll_ms
+        self.incoming = queue.Queue()
+        self.outgoing = queue.Queue()
+        self.sock = None
+        self.poll_id = None
+        self.closed = False
+
+    def connect(self, host, port):
+        """
+        - starts connecting in the background and begins polling. failures arrive as {"op": "disconnected"}.
+        """
+        threading.Thread(target=self.run, args=(host, port), daemon=True).start()
+        self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def send(self, message):
+        """
+        - queues message for the writer thread. never touches the socket on the calling thread.
+        """
+        self.outgoing.put(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    def close(self):
+        """
+        - stops delivering messages and drops the connection. safe to call from on_message, and before connecting has finished.
+        """
+        self.closed = True
+        if self.poll_id is not None:
+            self.widget.after_cancel(self.poll_id)
+            self.poll_id = None
+        self.outgoing.put(None) #wakes the writer thread so it can exit
+        if self.sock is not None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def poll(self):
+        """
+        - runs on the Tk thread. hands every queued message to on_message, then reschedules itself.
+        """
+        while not self.closed: #on_message may close the client part way through
+            try:
+                message = self.incoming.get_nowait()
+            except queue.Empty:
+                break
+            self.on_message(message)
+        if self.poll_id is not None:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def run(self, host, port):
+        """
+        - reader thread. connects, starts the writer thread, then turns each line into a message on incoming.
+        """
+        try:
+            self.sock = socket.create_connection((host, port))
+            if self.closed: #closed while connecting
+                return
+            threading.Thread(target=self.write_loop, daemon=True).start()
+            self.incoming.put({"op": "connected"})
+            with self.sock.makefile("rb") as lines:
+                for line in lines:
+                    self.incoming.put(json.loads(line))
+            self.incoming.put({"op": "disconnected", "message": "server closed the connection"})
+        except (OSError, ValueError) as error:
+            self.incoming.put({"op": "disconnected", "message": str(error)})
+        finally:
+            if self.sock is not None:
+                self.sock.close() #after the reader above, so the fd is released now and not by the garbage collector
+
+    def write_loop(self):
+        while True:
+            data = self.outgoing.get()
+            if data is None:
+                return
+            try:
+                self.sock.sendall(data)
+            except OSError as error:
+                self.incoming.put({"op": "disconnected", "message": str(error)})
+                return
@@ -0,0 +1,279 @@
+"""
+builds a hangman_dictionary index (the sorted, length-bucketed file the game memory-maps) from raw text corpora.
+
+inputs can be any mix of plain text files, .gz files and directories (searched recursively). big plain files are
+split into byte ranges that start and end on whitespace, so one multi-GB dump is spread over every worker process,
+newlines or not. a .gz file can't be seeked, so each is one task. every worker reads its range in blocks, so memory
+use follows the number of distinct words, never the size of the corpus or its lines.
+
+a word is counted once per occurrence if, after the alphabet's normalization (hangman_alphabets: case, accents,
+script variants), it's a whitespace-separated token made only of alphabet letters, at least MIN_WORD_LENGTH long,
+with any punctuation around it stripped. those are the same rules WordPage_func checks, so "Hello," counts as HELLO
+but "don't" and "abc123" are skipped, just as the game would refuse them. tokens over MAX_TOKEN_LENGTH characters
+are skipped too, so a token that could count is never cut at a block edge.
+
+the sources that went into an index are listed in a manifest next to it (<index>.sources). running again with new
+files only reads the new ones and adds their counts to the index's counts block. if a source already in the index
+has changed or gone, or the alphabet differs, everything is rebuilt.
+
+    python hangman_corpus.py dumps/ extra.txt.gz --output words.idx
+    python hangman_corpus.py dumps/new-batch/ --output words.idx      #incremental: adds to the sources already in words.idx
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+from collections import Counter
+
+import hangman_alphabets
+import hangman_dictionary
+import hangman_engine
+
+MANIFEST_VERSION = 1
+BLOCK_SIZE = 1 << 20 #bytes read at a time within a range
+MAX_TOKEN_LENGTH = 256 #longer whitespace-separated tokens are never counted
+MAX_TOKEN_BYTES = 4 * MAX_TOKEN_LENGTH #so a token that could count is never cut at a block or range edge
+WHITESPACE = (b" ", b"\n", b"\t", b"\r", b"\x0b", b"\x0c") #never inside a UTF-8 multibyte sequence
+CUT = b"0"
+
+#each pool worker's alphabet and compiled word_pattern(), set by init_worker()
+worker_alphabet = None
+worker_pattern = None
+
+def char_class(letters):
+    """
+    - a regex character class body for letters, with consecutive code points collapsed into ranges (Hangul is one range)
+    """
+    codes = sorted(set(map(ord, letters)))
+    parts, start = [], 0
+    for i in range(1, len(codes) + 1):
+        if i == len(codes) or codes[i] != codes[i - 1] + 1:
+            first, last = chr(codes[start]), chr(codes[i - 1])
+            parts.append(re.escape(first) if first == last else re.escape(first) + "-" + re.escape(last))
+            start = i
+    return "".join(parts)
+
+def word_pattern(alphabet):
+    """
+    - matches a whole whitespace-separated token, at most MAX_TOKEN_LENGTH long, that is letters only once leading
+    and trailing punctuation is dropped. group 1 is the word.
+    """
+    return re.compile(r"(?<!\S)(?=\S{1,%d}(?!\S))[^\w\s]*([%s]{%d,})[^\w\s]*(?!\S)"
+                      % (MAX_TOKEN_LENGTH, char_class(alphabet.letters), hangman_engine.MIN_WORD_LENGTH))
+
+def init_worker(alphabet_name):
+    global worker_alphabet, worker_pattern
+    worker_alphabet = hangman_alphabets.get(alphabet_name)
+    worker_pattern = word_pattern(worker_alphabet)
+
+def open_source(path):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+def first_space(data, start=0):
+    """
+    - index of the first whitespace byte in data at or after start, or -1
+    """
+    found = [i for i in (data.find(space, start) for space in WHITESPACE) if i >= 0]
+    return min(found) if found else -1
+
+def last_space(data, start=0):
+    """
+    - index of the last whitespace byte in data at or after start, or -1
+    """
+    return max(data.rfind(space, start) for space in WHITESPACE)
+
+def find_boundary(f, pos):
+    """
+    - where a range split at byte pos really starts: just past the first whitespace byte from pos - 1 on, so a token
+    straddling pos belongs to the range before. returns (offset, aligned). aligned is False when no whitespace is
+    within MAX_TOKEN_BYTES, and the token is cut at pos. both ranges around pos work this out the same way.
+    """
+    if pos == 0:
+        return 0, True
+    f.seek(pos - 1)
+    data = f.read(MAX_TOKEN_BYTES + 1)
+    i = first_space(data)
+    if i >= 0:
+        return pos + i, True
+    if len(data) <= MAX_TOKEN_BYTES:
+        return pos - 1 + len(data), True #the token runs to the end of the file
+    return pos, False
+
+def read_blocks(f, start, end, block_size=BLOCK_SIZE):
+    """
+    - yields blocks of whole whitespace-separated tokens from the bytes in [start, end). end None means to the end of
+    the file. a token straddling start belongs to the range before, and the token straddling end is read to its
+    finish. only the token straddling a block's end is carried over, and never more than MAX_TOKEN_BYTES of it, so
+    memory stays at one block however long the lines are.
+    a longer token can't be a word. where one has to be cut, at a block or range edge, CUT (a digit) is glued to
+    both pieces so word_pattern skips them.
+    """
+    start, aligned = find_boundary(f, start)
+    end, end_aligned = (None, True) if end is None else find_boundary(f, end)
+    f.seek(start)
+    pos = start
+    carry = b"" if aligned else CUT
+    while end is None or pos < end:
+        data = f.read(block_size if end is None else min(block_size, end - pos))
+        if not data:
+            break
+        pos += len(data)
+        data = carry + data
+        split = last_space(data, max(0, len(data) - MAX_TOKEN_BYTES))
+        if split < 0:
+            yield data + CUT
+            carry = CUT
+        else:
+            yield data[:split + 1]
+            carry = data[split + 1:]
+    if carry:
+        yield carry if end_aligned else carry + CUT
+
+def count_range(task):
+    """
+    - word counts for one (path, start, end) range. returns (Counter, bytes read).
+    """
+    path, start, end = task
+    counts = Counter()
+    read = 0
+    normalize, findall = worker_alphabet.normalize, worker_pattern.findall
+    with open_source(path) as f:
+        for data in read_blocks(f, start, end):
+            read += len(data)
+            counts.update(findall(normalize(data.decode("utf-8", "replace"))))
+    return counts, read
+
+def find_sources(paths):
+    """
+    - every file under paths (directories are walked), as sorted absolute paths
+    """
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, files in os.walk(path):
+                found.update(os.path.abspath(os.path.join(directory, name)) for name in files)
+        else:
+            found.add(os.path.abspath(path))
+    return sorted(found)
+
+def make_tasks(sources, chunk_bytes):
+    for path in sources:
+        size = os.path.getsize(path)
+        if path.endswith(".gz") or size <= chunk_bytes:
+            yield (path, 0, None)
+        else:
+            for start in range(0, size, chunk_bytes):
+                yield (path, start, min(start + chunk_bytes, size))
+
+def stat_key(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def manifest_path(index_path):
+    return index_path + ".sources"
+
+def read_manifest(index_path):
+    try:
+        with open(manifest_path(index_path), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+def write_manifest(index_path, alphabet_name, sources):
+    tmp = manifest_path(index_path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "alphabet": alphabet_name, "sources": sources}, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path(index_path))
+
+def index_counts(index_path):
+    """
+    - {word: frequency} read back from an existing index's words and counts blocks
+    """
+    counts = Counter()
+    with hangman_dictionary.Dictionary(index_path) as dictionary:
+        for length in dictionary.lengths():
+            counts.update(dict(zip(dictionary.words(length), dictionary.frequencies(length))))
+    return counts
+
+def plan(paths, index_path, alphabet_name, full=False):
+    """
+    - decides what to read. returns (sources to read, every source the index will hold, incremental?, the source
+    that forced a full rebuild or None)
+    """
+    own = {os.path.abspath(path) for path in (index_path, index_path + ".tmp", manifest_path(index_path), manifest_path(index_path) + ".tmp")}
+    given = [path for path in find_sources(paths) if path not in own] #the index may live inside a corpus directory
+    manifest = None if full else read_manifest(index_path)
+    if manifest is None or manifest["alphabet"] != alphabet_name or not os.path.exists(index_path):
+        return given, given, False, None
+    known = manifest["sources"]
+    for path, key in known.items():
+        if not os.path.exists(path) or stat_key(path) != key:
+            everything = sorted(set(given) | {path for path in known if os.path.exists(path)})
+            return everything, everything, False, path
+    new = [path for path in given if path not in known]
+    return new, sorted(set(known) | set(given)), True, None
+
+def ingest(sources, alphabet_name, workers=None, chunk_bytes=64 << 20, progress=None):
+    """
+    - counts every word in sources over a process pool. progress(bytes read, tasks done, tasks) runs after each task.
+    """
+    import multiprocessing
+    tasks = list(make_tasks(sources, chunk_bytes))
+    counts = Counter()
+    read = 0
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(alphabet_name,)) as pool:
+        for done, (task_counts, task_read) in enumerate(pool.imap_unordered(count_range, tasks), 1):
+            counts.update(task_counts)
+            read += task_read
+            if progress is not None:
+                progress(read, done, len(tasks))
+    return counts
+
+def build(paths, index_path, alphabet_name=hangman_alphabets.DEFAULT, workers=None, chunk_bytes=64 << 20, full=False,
+          progress=None, planned=None):
+    """
+    - builds or extends index_path from paths, following planned (what plan() returned) if given. returns (words in the
+    index, sources read, incremental?)
+    """
+    hangman_alphabets.get(alphabet_name) #fail on an unknown alphabet before starting the pool
+    to_read, sources, incremental = (planned or plan(paths, index_path, alphabet_name, full))[:3]
+    counts = ingest(to_read, alphabet_name, workers, chunk_bytes, progress) if to_read else Counter()
+    if incremental:
+        if not to_read:
+            return None, 0, True #nothing new
+        counts.update(index_counts(index_path))
+    keys = {path: stat_key(path) for path in sources}
+    hangman_dictionary.write_index(index_path, counts)
+    write_manifest(index_path, alphabet_name, keys) #after the index, so a crash in between only costs a full rebuild
+    return len(counts), len(to_read), incremental
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="build a hangman word index from text corpora")
+    parser.add_argument("inputs", nargs="+", help="text files, .gz files or directories")
+    parser.add_argument("--output", default=hangman_dictionary.DICTIONARY_PATH)
+    parser.add_argument("--alphabet", default=hangman_alphabets.DEFAULT, choices=hangman_alphabets.names())
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-mb", type=float, default=64, help="plain files larger than this are split across workers")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and read every source again")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    def progress(read, done, total):
+        seconds = time.perf_counter() - start
+        print("[%d/%d] %.1f MB, %.1f MB/s" % (done, total, read / 1e6, read / 1e6 / seconds if seconds else 0), flush=True)
+
+    planned = plan(args.inputs, args.output, args.alphabet, args.full)
+    if planned[3] is not None:
+        print("%s changed since the last build; rebuilding everything" % planned[3])
+    words, read, incremental = build(args.inputs, args.output, args.alphabet, args.workers,
+                                     max(1, int(args.chunk_mb * (1 << 20))), args.full, progress, planned)
+    if words is None:
+        print("%s is up to date" % args.output)
+    else:
+        print("%d words written to %s from %d %ssource(s)" % (words, args.output, read, "new " if incremental else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+compact on-disk word index used for dictionary checks (and by the solver tools).
+
+the index file is memory-mapped, and nothing is read until the first lookup, so creating a Dictionary costs nothing at startup.
+
+layout (little-endian):
+- header: magic b"HMDX", version, bucket count
+- one table entry per word length: length, record width, word count, letter count, and offsets of its three blocks
+- words block: the bucket's words, UTF-8 encoded, padded with NUL to the record width and sorted
+- counts block: one uint32 frequency per word (1 when built from a plain list)
+- letters block: (first letter code point, first record) pairs, so a lookup only binary-searches words sharing its length and first letter
+
+    python hangman_dictionary.py build words.txt words.idx
+    python hangman_dictionary.py check words.idx HANGMAN
+"""
+import argparse
+import mmap
+import os
+import struct
+import threading
+
+import hangman_engine
+
+MAGIC = b"HMDX"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+BUCKET = struct.Struct("<IIIIQQQ")
+LETTER = struct.Struct("<II")
+
+#default index location, next to the game
+DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.idx")
+
+def write_index(path, counts):
+    """
+    - writes counts ({word: frequency}) to path in the index format. words must already be normalized (uppercase).
+    """
+    buckets = dict()
+    for word, count in counts.items():
+        buckets.setdefault(len(word), []).append((word.encode("utf-8"), count))
+
+    table, blocks = [], []
+    offset = HEADER.size + BUCKET.size * len(buckets)
+    for length in sorted(buckets):
+        entries = buckets[length]
+        width = max(len(encoded) for encoded, count in entries)
+        records = sorted((encoded.ljust(width, b"\0"), count) for encoded, count in entries)
+
+        letters = []
+        for i, (record, count) in enumerate(records):
+            first = ord(record.rstrip(b"\0").decode("utf-8")[0])
+            if not letters or letters[-1][0] != first:
+                letters.append((first, i))
+
+        words_block = b"".join(record for record, count in records)
+        counts_block = struct.pack("<%dI" % len(records), *(min(count, 0xFFFFFFFF) for record, count in records))
+        letters_block = b"".join(LETTER.pack(first, start) for first, start in letters)
+
+        words_offset = offset
+        counts_offset = words_offset + len(words_block)
+        letters_offset = counts_offset + len(counts_block)
+        offset = letters_offset + len(letters_block)
+        table.append(BUCKET.pack(length, width, len(records), len(letters), words_offset, counts_offset, letters_offset))
+        blocks += [words_block, counts_block, letters_block]
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(table)))
+        f.writelines(table)
+        f.writelines(blocks)
+    os.replace(tmp_path, path) #readers never see a half-written index
+
+def build_index(words, path):
+    """
+    - builds an index from an iterable of plain words. each word is uppercased and kept only if validate_word() accepts it.
+    """
+    counts = dict()
+    for word in words:
+        word = word.strip().upper()
+        if hangman_engine.validate_word(word) is None:
+            counts[word] = counts.get(word, 0) + 1
+    write_index(path, counts)
+    return len(counts)
+
+class Bucket:
+    """
+    all words of one length inside the mapped file
+    """
+    __slots__ = ("length", "width", "count", "words_offset", "counts_offset", "letters")
+
+    def __init__(self, data, length, width, count, n_letters, words_offset, counts_offset, letters_offset):
+        self.length = length
+        self.width = width
+        self.count = count
+        self.words_offset = words_offset
+        self.counts_offset = counts_offset
+        #first letter -> (first record, end record). at most one entry per alphabet letter, so it is cheap to keep in memory
+        starts = [LETTER.unpack_from(data, letters_offset + i * LETTER.size) for i in range(n_letters)]
+        ends = [start for first, start in starts[1:]] + [count]
+        self.letters = {chr(first): (start, end) for (first, start), end in zip(starts, ends)}
+
+class MappedFile:
+    """
+    base for read-only index files. the file is opened and mapped on first use, not in __init__: subclasses call
+    _map() from their own loading code, and clear whatever that loaded in _unload().
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._data = None
+
+    def _map(self):
+        self._file = open(self.path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._data
+
+    def _unload(self):
+        pass
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+        if self._file is not None:
+            self._file.close()
+        self._file = self._data = None
+        self._unload()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class Dictionary(MappedFile):
+    """
+    read-only view of a word index file
+    """
+    def __init__(self, path=DICTIONARY_PATH):
+        MappedFile.__init__(self, path)
+        self._buckets = None
+        self._lock = threading.Lock() #background workers (hangman_workers) may make the first lookup
+
+    def available(self):
+        """
+        - True if the index file exists. does not open it.
+        """
+        return self._data is not None or os.path.exists(self.path)
+
+    def _load(self):
+        self._map()
+        magic, version, n_buckets = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("%s is not a hangman word index" % self.path)
+        buckets = dict()
+        for i in range(n_buckets):
+            fields = BUCKET.unpack_from(self._data, HEADER.size + i * BUCKET.size)
+            buckets[fields[0]] = Bucket(self._data, *fields)
+        self._buckets = buckets #set last: other threads treat it as the "loaded" flag
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._buckets is None:
+                self._load()
+
+    @property
+    def buckets(self):
+        if self._buckets is None:
+            self._ensure_loaded()
+        return self._buckets
+
+    @property
+    def data(self):
+        """
+        - the mapped file itself, for tools that read buckets in bulk (see hangman_solver)
+        """
+        if self._buckets is None:
+            self._ensure_loaded()
+        return self._data
+
+    def _unload(self):
+        self._buckets = None
+
+    def _find(self, word):
+        """
+        - returns (bucket, record index) of word, or (None, -1). binary search within the word's length and first letter.
+        """
+        bucket = self.buckets.get(len(word))
+        if bucket is None or not word:
+            return None, -1
+        span = bucket.letters.get(word[0])
+        if span is None:
+            return None, -1
+        key = word.encode("utf-8")
+        width = bucket.width
+        if len(key) > width:
+            return None, -1
+        key = key.ljust(width, b"\0")
+
+        data, base = self._data, bucket.words_offset
+        low, high = span
+        while low < high:
+            mid = (low + high) // 2
+            start = base + mid * width
+            record = data[start:start + width]
+            if record < key:
+                low = mid + 1
+            elif record > key:
+                high = mid
+            else:
+                return bucket, mid
+        return None, -1
+
+    def __contains__(self, word):
+        return self._find(word)[0] is not None
+
+    def frequency(self, word):
+        bucket, i = self._find(word)
+        if bucket is None:
+            return 0
+        return struct.unpack_from("<I", self._data, bucket.counts_offset + i * 4)[0]
+
+    def lengths(self):
+        return sorted(self.buckets)
+
+    def count(self, length=None):
+        if length is None:
+            return sum(bucket.count for bucket in self.buckets.values())
+        bucket = self.buckets.get(length)
+        return bucket.count if bucket else 0
+
+    def words(self, length):
+        """
+        - yields every word of the given length in sorted order, straight from the mapped file
+        """
+        bucket = self.buckets.get(length)
+        if bucket is None:
+            return
+        width, data = bucket.width, self._data
+        if width == length: #every word is one byte per letter, so there is no padding to strip
+            for start in range(bucket.words_offset, bucket.words_offset + bucket.count * width, width):
+                yield data[start:start + width].decode("ascii")
+        else:
+            for start in range(bucket.words_offset, bucket.words_offset + bucket.count * width, width):
+                yield data[start:start + width].rstrip(b"\0").decode("utf-8")
+
+    def frequencies(self, length):
+        """
+        - the bucket's per-word counts, in the same order as words(length)
+        """
+        bucket = self.buckets.get(length)
+        if bucket is None:
+            return []
+        return struct.unpack_from("<%dI" % bucket.count, self._data, bucket.counts_offset)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="build or query a hangman word index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build an index from a plain word list")
+    build.add_argument("words")
+    build.add_argument("index", nargs="?", default=DICTIONARY_PATH)
+    check = commands.add_parser("check", help="look words up in an index")
+    check.add_argument("index")
+    check.add_argument("word", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        with open(args.words, encoding="utf-8") as f:
+            total = build_index(f, args.index)
+        print("%d words written to %s" % (total, args.index))
+    else:
+        with Dictionary(args.index) as dictionary:
+            for word in args.word:
+                word = word.upper()
+                print(word, "yes" if word in dictionary else "no")
+
+if __name__ == "__main__":
+    main()
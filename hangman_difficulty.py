@@ -0,0 +1,224 @@
+"""
+word difficulty index for single-player games, where the computer picks the word.
+
+a word's difficulty is how many misses the hangman_solver hint engine makes before it solves the word. that's far
+too slow to work out while a player waits, so "build" scores the whole hangman_dictionary index offline, spread over
+a process pool, and writes the result to its own file:
+- header: magic, version, number of levels, record width, and the dictionary file's size and mtime when it was scored
+- one table entry per level: first record, record count, fewest and most misses in the level
+- records: misses (one byte) then the word, UTF-8, padded with NUL to the record width. sorted by misses, then word
+
+levels are cut from the sorted records at miss counts, each cut moved from an exact third to an end of its run of
+equal misses, so a score always gets one level. each level is one contiguous run and picking a word is one random
+record read: O(1) whatever the dictionary size. if the dictionary has been rebuilt since scoring, its size or mtime
+won't match the header and the index reports itself stale instead of handing out words that may no longer exist.
+
+    python hangman_difficulty.py build
+    python hangman_difficulty.py pick hard
+"""
+import argparse
+import bisect
+import os
+import random
+import struct
+import time
+
+import hangman_dictionary
+import hangman_engine
+
+DIFFICULTY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "difficulty.idx")
+
+MAGIC = b"HMDF"
+VERSION = 2 #bump whenever the scoring or level cuts change, so old indexes count as stale
+HEADER = struct.Struct("<4sHHIQq")
+LEVEL = struct.Struct("<IIBB")
+
+LEVELS = ("Easy", "Medium", "Hard")
+
+worker_solver = None #the pool worker's Solver, set up by init_worker()
+
+def fingerprint(path):
+    """
+    - (size, mtime in ns) of the dictionary file. rebuilding the dictionary replaces the file, which changes both.
+    """
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def solver_misses(solver, word):
+    """
+    - plays word with the hint engine guessing (no guess limit) and returns how many of its guesses missed
+    """
+    import hangman_solver
+    hinter = hangman_solver.Hinter(solver, len(word))
+    state = hangman_engine.play(word, len(hangman_engine.ALPHABET), lambda state: hinter.hint(state.blank, state.guessed_order))
+    return state.misses
+
+def init_worker(dictionary_path):
+    """
+    - pool initializer. every worker maps the same dictionary file, so the word matrices are shared pages, not copies.
+    """
+    global worker_solver
+    import hangman_solver
+    worker_solver = hangman_solver.Solver(hangman_dictionary.Dictionary(dictionary_path))
+
+def score_chunk(chunk):
+    return [(solver_misses(worker_solver, word), word) for word in chunk]
+
+def score(dictionary_path, workers=None, chunk_size=200, progress=None):
+    """
+    - returns [(misses, word)] for every dictionary word, sorted. progress(done, total) runs after each chunk.
+    """
+    import multiprocessing #only the builder needs these; the game imports this module for DifficultyIndex
+    from hangman_tournament import chunked
+    with hangman_dictionary.Dictionary(dictionary_path) as dictionary:
+        words = [word for length in dictionary.lengths() for word in dictionary.words(length)]
+    scored = []
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(dictionary_path,)) as pool:
+        for results in pool.imap_unordered(score_chunk, chunked(words, chunk_size)):
+            scored += results
+            if progress is not None:
+                progress(len(scored), len(words))
+    scored.sort()
+    return scored
+
+def level_cuts(misses, levels):
+    """
+    - record indexes where each level after the first starts, given sorted misses. each cut starts at an exact
+    fraction (or just past the previous cut) and moves to an end of the run of equal misses it falls in, so equal
+    scores share a level: the nearer end, unless only the other one leaves the level before it some words.
+    """
+    cuts = []
+    for level in range(1, levels):
+        previous = cuts[-1] if cuts else 0
+        cut = min(max(len(misses) * level // levels, previous + 1), len(misses))
+        if cut < len(misses) and misses[cut - 1] == misses[cut]:
+            low, high = bisect.bisect_left(misses, misses[cut]), bisect.bisect_right(misses, misses[cut])
+            cut = low if low > previous and cut - low <= high - cut else high
+        cuts.append(cut)
+    return cuts
+
+def write_index(path, scored, source):
+    """
+    - writes sorted (misses, word) pairs split into len(LEVELS) levels by level_cuts(). source is the dictionary's
+    fingerprint(). written to a temporary file and renamed over path, so a reader never sees a half-written index.
+    """
+    records = [(min(misses, 0xFF), word.encode("utf-8")) for misses, word in scored]
+    width = max((len(data) for misses, data in records), default=0)
+    size, mtime = source
+
+    table = []
+    bounds = [0] + level_cuts([misses for misses, data in records], len(LEVELS)) + [len(records)]
+    for first, end in zip(bounds, bounds[1:]):
+        low, high = (records[first][0], records[end - 1][0]) if end > first else (0, 0)
+        table.append(LEVEL.pack(first, end - first, low, high))
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(LEVELS), width, size, mtime))
+        f.writelines(table)
+        f.writelines(bytes((misses,)) + data.ljust(width, b"\0") for misses, data in records)
+    os.replace(tmp, path)
+    return len(records)
+
+class DifficultyIndex(hangman_dictionary.MappedFile):
+    """
+    read-only view of a difficulty index
+    """
+    def __init__(self, path=DIFFICULTY_PATH, dictionary_path=hangman_dictionary.DICTIONARY_PATH):
+        hangman_dictionary.MappedFile.__init__(self, path)
+        self.dictionary_path = dictionary_path
+        self._levels = None
+        self._width = 0
+        self._source = None
+
+    def _load(self):
+        self._map()
+        magic, version, n_levels, width, size, mtime = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("%s is not a hangman difficulty index" % self.path)
+        self._width = width
+        self._source = (size, mtime, version)
+        self._levels = [LEVEL.unpack_from(self._data, HEADER.size + i * LEVEL.size) for i in range(n_levels)]
+
+    @property
+    def levels(self):
+        """
+        - (first record, count, fewest misses, most misses) for each level, easiest first
+        """
+        if self._levels is None:
+            self._load()
+        return self._levels
+
+    def stale(self):
+        """
+        - True if the index is missing, was written by another version, or was scored against a different dictionary file
+        """
+        try:
+            self.levels
+            size, mtime, version = self._source
+            return version != VERSION or (size, mtime) != fingerprint(self.dictionary_path)
+        except (OSError, ValueError, struct.error):
+            return True
+
+    def _unload(self):
+        self._levels = None
+
+    def record(self, index):
+        """
+        - (misses, word) of record index
+        """
+        offset = HEADER.size + len(self.levels) * LEVEL.size + index * (self._width + 1)
+        data = self._data[offset:offset + self._width + 1]
+        return data[0], data[1:].rstrip(b"\0").decode("utf-8")
+
+    def pick(self, level, rng=random):
+        """
+        - a random word from level (an index into LEVELS), or None if the level is empty. one record read.
+        """
+        first, count, low, high = self.levels[level]
+        if not count:
+            return None
+        return self.record(first + rng.randrange(count))[1]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="build or query the word difficulty index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="score every dictionary word (skipped if the index is up to date)")
+    build.add_argument("--dictionary", default=hangman_dictionary.DICTIONARY_PATH)
+    build.add_argument("--output", default=DIFFICULTY_PATH)
+    build.add_argument("--workers", type=int, default=os.cpu_count())
+    build.add_argument("--chunk-size", type=int, default=200)
+    build.add_argument("--force", action="store_true", help="rebuild even if the index matches the dictionary")
+    pick = commands.add_parser("pick", help="print random words from a level")
+    pick.add_argument("level", choices=[level.lower() for level in LEVELS])
+    pick.add_argument("--count", type=int, default=5)
+    pick.add_argument("--index", default=DIFFICULTY_PATH)
+    pick.add_argument("--dictionary", default=hangman_dictionary.DICTIONARY_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        with DifficultyIndex(args.output, args.dictionary) as index:
+            if not args.force and not index.stale():
+                print("%s is up to date" % args.output)
+                return
+        source = fingerprint(args.dictionary)
+        start = time.perf_counter()
+        def progress(done, total):
+            print("[%d/%d %.1fs]" % (done, total, time.perf_counter() - start), flush=True)
+        scored = score(args.dictionary, args.workers, args.chunk_size, progress)
+        total = write_index(args.output, scored, source)
+        print("%d words written to %s" % (total, args.output))
+        with DifficultyIndex(args.output, args.dictionary) as index:
+            for name, (first, count, low, high) in zip(LEVELS, index.levels):
+                print("  %-6s %7d words, %d-%d misses" % (name, count, low, high))
+    else:
+        with DifficultyIndex(args.index, args.dictionary) as index:
+            if index.stale():
+                parser.error("%s is missing or out of date; run build first" % args.index)
+            level = [name.lower() for name in LEVELS].index(args.level)
+            for i in range(args.count):
+                print(index.pick(level))
+
+if __name__ == "__main__":
+    main()
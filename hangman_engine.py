@@ -0,0 +1,196 @@
+"""
+headless hangman engine. holds all of the game rules so a round can be played without a Tk interpreter.
+the pages in hangman_game_ui.py are thin views over a GameState; simulators and benchmarks use it directly.
+"""
+import string
+
+ALPHABET = string.ascii_uppercase
+MIN_WORD_LENGTH = 2
+MIN_GUESSES, MAX_GUESSES = 5, 15
+
+#results returned by guess()
+INVALID, REPEATED, WRONG, CORRECT = range(4)
+
+def letter_bits(alphabet):
+    """
+    - builds the letter -> bit table used for the guessed bitmask. one bit per letter of the alphabet.
+    """
+    return {letter: 1 << i for i, letter in enumerate(alphabet)}
+
+LETTER_BITS = letter_bits(ALPHABET)
+
+def index_positions(word):
+    """
+    - maps each letter of word to a tuple of the positions it sits at. built once per game so a guess never rescans the word.
+    """
+    positions = dict()
+    for i, letter in enumerate(word):
+        positions.setdefault(letter, []).append(i)
+    return {letter: tuple(index) for letter, index in positions.items()}
+
+def validate_word(word, bits=LETTER_BITS):
+    """
+    - same rules WordPage_func() enforces on an entered word. returns an error message, or None when word is valid.
+    """
+    if len(word) < MIN_WORD_LENGTH:
+        return "Enter a word at least 2 letters long"
+    for letter in word:
+        if letter not in bits:
+            return "Your word can only contain letters"
+    return None
+
+def normalize_phrase(text):
+    """
+    - uppercases a phrase and collapses runs of whitespace (including newlines) into single spaces
+    """
+    return " ".join(text.upper().split())
+
+def validate_phrase(phrase, bits=LETTER_BITS):
+    """
+    - phrase-mode rules: letters plus anything that isn't a letter (spaces, punctuation, digits), which is revealed up front.
+    letters outside the alphabet are rejected, and there must be at least 2 letters to guess. returns an error message or None.
+    """
+    letters = 0
+    for char in phrase:
+        if char in bits:
+            letters += 1
+        elif char.isalpha():
+            return "Your phrase can only use letters, spaces and punctuation"
+    if letters < MIN_WORD_LENGTH:
+        return "Enter a phrase with at least 2 letters"
+    return None
+
+def read_word_list(path):
+    """
+    - reads a plain word list, one word per line. words are uppercased and anything validate_word() rejects is skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        words = [line.strip().upper() for line in f]
+    return [word for word in words if validate_word(word) is None]
+
+class GameState:
+    """
+    compact state for one round:
+    - guessed is an int bitmask with one bit per letter (see LETTER_BITS)
+    - positions maps letter -> positions in word, so a correct guess only touches the blanks it reveals
+    - blank is the word blank the UI displays ("_" for hidden letters). anything that isn't a letter (phrase mode spaces and punctuation) starts out revealed
+    """
+    __slots__ = ("word", "positions", "bits", "blank", "guessed", "guessed_order", "hidden", "guesses_left", "misses")
+
+    def __init__(self, word, guesses_left, bits=LETTER_BITS):
+        self.word = word
+        self.positions = {letter: index for letter, index in index_positions(word).items() if letter in bits}
+        self.bits = bits
+        self.blank = [char if char not in bits else "_" for char in word]
+        self.guessed = 0
+        self.guessed_order = []
+        self.hidden = sum(len(index) for index in self.positions.values()) #letters still showing as "_"
+        self.guesses_left = guesses_left
+        self.misses = 0
+
+    @property
+    def won(self):
+        return self.hidden == 0
+
+    @property
+    def lost(self):
+        return self.guesses_left <= 0 and self.hidden > 0
+
+    @property
+    def over(self):
+        return self.hidden == 0 or self.guesses_left <= 0
+
+    def is_guessed(self, letter):
+        bit = self.bits.get(letter)
+        return bit is not None and self.guessed & bit != 0
+
+def guess(state, letter):
+    """
+    - applies one guess to state and returns INVALID, REPEATED, WRONG or CORRECT.
+    - INVALID and REPEATED leave state untouched, same as check_player_guess() ignoring a bad entry.
+    """
+    bit = state.bits.get(letter) if len(letter) == 1 else None
+    if bit is None:
+        return INVALID
+    if state.guessed & bit:
+        return REPEATED
+
+    state.guessed |= bit
+    state.guessed_order.append(letter)
+    hits = state.positions.get(letter)
+    if hits is None:
+        state.guesses_left -= 1
+        state.misses += 1
+        return WRONG
+
+    blank = state.blank
+    for i in hits:
+        blank[i] = letter
+    state.hidden -= len(hits)
+    return CORRECT
+
+def play(word, guesses_left, guesser):
+    """
+    - plays a full round headless. guesser(state) returns the next letter to try.
+    - returns the finished GameState. raises ValueError if guesser offers an invalid or repeated letter, which would otherwise loop forever.
+    """
+    state = GameState(word, guesses_left)
+    while not state.over:
+        letter = guesser(state)
+        if guess(state, letter) < WRONG:
+            raise ValueError("guesser returned an invalid or repeated letter: %r" % (letter,))
+    return state
+
+def open_state(length, guesses_left, bits=LETTER_BITS, blank=None):
+    """
+    - GameState for a word this side doesn't know: one nobody has picked yet (hangman_solver.Adversary), or one held by
+    the other player's window in a network game. every position starts hidden, unless blank is given (a phrase's
+    spaces and punctuation, as hangman_server sends them). no letter has positions until commit() gives it some, and
+    word stays "" until it's revealed at the end.
+    """
+    state = GameState("", guesses_left, bits)
+    state.blank = ["_"] * length if blank is None else list(blank)
+    state.hidden = state.blank.count("_")
+    return state
+
+def commit(state, letter, positions):
+    """
+    - says where letter sits in an open_state() word, just before guess() applies it. empty positions make it a miss.
+    """
+    if positions:
+        state.positions[letter] = tuple(positions)
+
+class Match:
+    """
+    everything one round of the Tk game needs, from the settings through to the gameover messages.
+    the pages keep their Tk variables and copy to and from a Match, so a process can hold as many matches as it likes.
+    starting a new round is one swap: match = match.next_round()
+    """
+    __slots__ = ("player_one", "player_two", "word_picker", "word_guesser", "guesses", "phrase", "difficulty", "alphabet", "adversary", "network", "game", "gameover_messages")
+
+    def __init__(self, player_one="Player 1", player_two="Player 2", guesses=MIN_GUESSES, phrase=False, difficulty="Medium", alphabet="english"):
+        self.player_one = player_one
+        self.player_two = player_two
+        self.word_picker = None #names, assigned once SettingsPage is confirmed
+        self.word_guesser = None
+        self.guesses = guesses
+        self.phrase = phrase
+        self.difficulty = difficulty #level name from hangman_difficulty.LEVELS, used when the computer picks the word
+        self.alphabet = alphabet #hangman_alphabets name the word and guesses are checked against
+        self.adversary = None #hangman_solver.Adversary when the computer is picking as the game goes, rather than up front
+        self.network = None #"picker" or "guesser": this window's side of a hangman_server game
+        self.game = None #GameState, created once the word is in
+        self.gameover_messages = ("", "")
+
+    @property
+    def target_name(self):
+        """
+        - "phrase" or "word", for messages
+        """
+        return "phrase" if self.phrase else "word"
+
+    def next_round(self):
+        """
+        - fresh Match for the next round. player names, phrase mode, difficulty and alphabet carry over; everything else starts again.
+        """
+        return Match(self.player_one, self.player_two, phrase=self.phrase, difficulty=self.difficulty, alphabet=self.alphabet)
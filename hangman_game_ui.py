@@ -1,43 +1,114 @@
-import string
+import os
+import random
 import tkinter as tk
 from tkinter import ttk
 
+import hangman_alphabets
+import hangman_dictionary
+import hangman_difficulty
+import hangman_engine
+import hangman_log
+import hangman_stats
+import hangman_workers
+
+COMPUTER = hangman_stats.COMPUTER #word_picker name in single-player games
+EVIL = "Evil" #difficulty where the computer never commits to a word (hangman_solver.Adversary)
+EVIL_LENGTHS = range(4, 13) #word lengths the adversary plays, weighted by how many dictionary words each has
+NETWORK = "Network" #word_picker choice for a game against another window through hangman_server
+
+#styles for widgets used throughout the program. each page lists the ones it needs, and they're configured when that page is first built
+STYLES = {
+    "ButtonGeneral.TButton": dict(font=("IBM Plex Sans", 13)),
+    "DisplayGeneral.TLabel": dict(font=("IBM Plex Sans Light", 15)),
+    "WordBlank.TLabel": dict(font=("IBM Plex Sans", 22)),
+    "LabelGeneral.TLabel": dict(font=("IBM Plex Sans Medium", 15)),
+    "LabelError.TLabel": dict(foreground="red", font=("IBM Plex Sans Condensed", 13)),
+    "LabelCorrect.TLabel": dict(foreground="Green", font=("IBM Plex Sans Condensed", 13)),
+    "EntryGeneral.TEntry": dict(font=("IBM Plex Sans Medium", 15)),
+}
+
+#gallows parts in the order they appear: (shape, coordinates on a 100x150 canvas). spread over however many guesses the round has
+GALLOWS_PARTS = (
+    ("line", (10, 140, 90, 140)), #base
+    ("line", (25, 140, 25, 10)), #post
+    ("line", (25, 10, 70, 10)), #beam
+    ("line", (70, 10, 70, 28)), #rope
+    ("oval", (60, 28, 80, 48)), #head
+    ("line", (70, 48, 70, 90)), #body
+    ("line", (70, 58, 55, 75)), #left arm
+    ("line", (70, 58, 85, 75)), #right arm
+    ("line", (70, 90, 57, 115)), #left leg
+    ("line", (70, 90, 83, 115)), #right leg
+    ("line", (57, 115, 51, 115)), #left foot
+    ("line", (83, 115, 89, 115)), #right foot
+    ("line", (64, 34, 67, 37)), #left eye
+    ("line", (73, 34, 76, 37)), #right eye
+    ("line", (65, 43, 75, 43)), #mouth
+)
+
 class WindowMain(tk.Tk):
     """
     root window that holds all other frames.
     has two funcs(), next_page() and var_refresh().
+    pages are built the first time next_page() asks for them, so only StartPage exists when the window first shows.
+    all game state lives in self.match (a hangman_engine.Match). the pages only hold the Tk variables that display it, so several windows can run side by side.
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        style = ttk.Style(self)
+        self.style = ttk.Style(self)
+        self.styles_configured = set()
+        self.match = hangman_engine.Match()
+        self.stats = hangman_stats.Stats() #no file is touched until the first game is recorded
+        self.game_log = hangman_log.GameLogger() #binary event log of every game, opened on the first event
+        self.recording = True #False while hangman_log replays games through this window
+        self.workers = hangman_workers.WorkerBridge(self) #slow jobs run here; their results come back through after() polling
+        self.client = None #hangman_client.Client while a network game is being set up or played
+        self.current_page = None
 
         self.columnconfigure(0, weight=1)
         self.geometry("400x300")
-        self.frames = dict() #create a dict that we can use to cycle through FrameClass creation
+        self.frames = dict() #FrameClass -> frame, filled in by build_page()
 
-        container = ttk.Frame() #container that holds all frames inside of WindowMain()
-        container.grid(row=0, column=0)
+        self.container = ttk.Frame(self) #container that holds all frames inside of WindowMain()
+        self.container.grid(row=0, column=0)
 
-        #initialize frame classes using a loop, stores them in dict()
-        for FrameClass in (StartPage, SettingsPage, WordPage, GamePage):
-            frame = FrameClass(container, self, style)
-            self.frames[FrameClass] = frame
-            frame.grid(row=0, column=0, sticky="NSEW")
+        self.profiler = None
+        if os.environ.get("HANGMAN_PROFILE"): #opt-in latency instrumentation. when off, nothing is imported or wrapped
+            import hangman_profile
+            hangman_profile.install(self)
 
         self.next_page(StartPage) #raises StartPage to begin program
 
-        print(self.frames)
-        print(StartPage)
-        print(self.frames[StartPage])
+    def build_page(self, page):
+        """
+        creates page the first time it's needed and stores it in frames. configures any styles the page uses that haven't been set up yet.
+        """
+        for name in page.styles:
+            if name not in self.styles_configured:
+                self.style.configure(name, **STYLES[name])
+                self.styles_configured.add(name)
+
+        frame = page(self.container, self, self.style)
+        self.frames[page] = frame
+        frame.grid(row=0, column=0, sticky="NSEW")
+        return frame
 
     def next_page(self, page, *args):
         """
-        raises the next page in the game flow. takes page and finds the class in frames, then raises that frame.
+        raises the next page in the game flow. takes page and finds the class in frames, building it first if needed, then raises that frame.
+        each page's show() copies the current match into its Tk variables before it's raised.
+        background work started by the page being left is cancelled, so a late result can't land on the wrong page.
         """
+        if self.current_page is not None and page != self.current_page:
+            self.workers.cancel_group(self.current_page)
+        self.current_page = page
         if page == SettingsPage: #condition to reset all variables at each new round when SettingsPage is raised
             self.var_refresh()
-        frame = self.frames[page]
+        frame = self.frames.get(page)
+        if frame is None:
+            frame = self.build_page(page)
+        frame.show()
         self.bind_func(page)
         frame.tkraise()
 
@@ -45,36 +116,87 @@ class WindowMain(tk.Tk):
 
         #bind update_Word_Picker
         if page == SettingsPage:
-            self.bind("<Return>", lambda event, controller=self: SettingsPage.update_Word_Picker(controller, event))
+            self.bind("<Return>", self.frames[SettingsPage].update_Word_Picker)
 
         #bind WordPage_func
         elif page == WordPage:
-            self.bind("<Return>", lambda event, controller=self: WordPage.WordPage_func(controller, event))
+            self.bind("<Return>", self.frames[WordPage].WordPage_func)
 
         #bind GamePage_func
         elif page == GamePage:
-            self.bind("<Return>", lambda event, controller=self: GamePage.GamePage_func(controller, event))
+            self.bind("<Return>", self.frames[GamePage].GamePage_func)
+
+    def destroy(self):
+        """
+        - flushes any stats still queued, the game log and (when profiling) the latency export before the window goes away
+        """
+        self.workers.shutdown()
+        self.close_network()
+        self.stats.close()
+        self.game_log.close()
+        if self.profiler is not None:
+            import hangman_profile
+            self.profiler.export(hangman_profile.export_path())
+        super().destroy()
+
+    def start_game(self, game_word):
+        """
+        starts the match's GameState for game_word and logs it. used by WordPage, and by SettingsPage when the computer picks.
+        with an adversary on the match there's no word yet: the state starts open (hangman_engine.open_state) and the
+        round isn't logged, since a replay needs a fixed word.
+        on the guessing side of a network game the word stays on the server, so game_word is the blank it sent. the
+        picker's window logs that round.
+        """
+        match = self.match
+        bits = hangman_alphabets.get(match.alphabet).bits
+        if match.adversary is not None:
+            match.game = hangman_engine.open_state(match.adversary.length, match.guesses, bits)
+            return
+        if match.network == "guesser":
+            match.game = hangman_engine.open_state(len(game_word), match.guesses, bits, game_word)
+            return
+        match.game = hangman_engine.GameState(game_word, match.guesses, bits)
+        if self.recording:
+            self.game_log.start(match)
 
     def var_refresh(self):
         """
-        manually resets all vars for new round. I know this is probably not the most efficient way to do this.
-        """
-        StartPage.gameover_message_one.set("")
-        StartPage.gameover_message_two.set("")
-        SettingsPage.word_picker.set("")
-        SettingsPage.word_guesser.set("")
-        SettingsPage.error_message.set("")
-        SettingsPage.enter_word_message.set("")
-        WordPage.game_word.set("")
-        WordPage.error_message_wordpage.set("")
-        WordPage.word_blank.set("")
-        WordPage.word_blank_mirror.clear()
-        GamePage.letters_guessed.set("")
-        GamePage.letters_guessed_mirror.clear()
-        SettingsPage.guesses_left.set(5)
-        GamePage.player_guess.set("")
-        GamePage.error_message_gamepage.set("")
-        GamePage.correct_ans.set("")
+        resets the game for a new round by swapping in a fresh Match. player names and phrase mode carry over.
+        the pages pick up the new values in show() as they're raised.
+        """
+        self.close_network()
+        self.match = self.match.next_round()
+
+    def connect(self, host, port):
+        """
+        - opens a hangman_client connection for a network game. server messages come back to network_message().
+        """
+        import hangman_client
+        self.close_network()
+        self.client = hangman_client.Client(self, self.network_message)
+        self.client.connect(host, port)
+        return self.client
+
+    def close_network(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    def network_message(self, message):
+        """
+        - called on the Tk thread for every message from the server. the other player leaving or the connection
+        dropping ends the round wherever it is; anything else goes to network_<op>() on the page being shown, if it has one.
+        """
+        op = message.get("op")
+        if op == "left" or op == "disconnected":
+            self.close_network()
+            reason = message.get("name", "The other player") + " left" if op == "left" else message.get("message", "")
+            self.match.gameover_messages = ("The network game ended", reason)
+            self.next_page(StartPage)
+            return
+        handler = getattr(self.frames.get(self.current_page), "network_" + str(op), None)
+        if handler is not None:
+            handler(message)
 
 class StartPage(ttk.Frame):
 
@@ -82,100 +204,126 @@ class StartPage(ttk.Frame):
     StartPage does 1 thing: asks the user if they want to play a game or quit.
     Using the button calls next_page(SettingsPage) to move on to settings.
     """
+    styles = ("ButtonGeneral.TButton", "LabelGeneral.TLabel")
 
     def __init__(self, container, controller, style, **kwargs):
         super().__init__(container, **kwargs)
 
-        StartPage.gameover_message_one = tk.StringVar()
-        StartPage.gameover_message_two = tk.StringVar()
+        self.controller = controller
+        self.gameover_message_one = tk.StringVar()
+        self.gameover_message_two = tk.StringVar()
 
         self.columnconfigure((0,1), weight=1)
         self.rowconfigure((0), minsize=60)
         self.rowconfigure((1), minsize=10)
 
-        #styles for widgets used throughout the program
-        style.configure("ButtonGeneral.TButton", font=("IBM Plex Sans", 13))
-        style.configure("DisplayGeneral.TLabel", font=("IBM Plex Sans Light", 15))
-        style.configure("WordBlank.TLabel", font=("IBM Plex Sans", 22))
-        style.configure("LabelGeneral.TLabel", font=("IBM Plex Sans Medium", 15))
-        style.configure("LabelError.TLabel", foreground="red", font=("IBM Plex Sans Condensed", 13))
-        style.configure("LabelCorrect.TLabel", foreground="Green", font=("IBM Plex Sans Condensed", 13))
-        style.configure("EntryGeneral.TEntry", font=("IBM Plex Sans Medium", 15))
-
-        gameover_message_label_one = ttk.Label(self, style="LabelGeneral.TLabel", textvariable=StartPage.gameover_message_one)
-        gameover_message_label_two = ttk.Label(self, style="LabelGeneral.TLabel", textvariable=StartPage.gameover_message_two)
+        gameover_message_label_one = ttk.Label(self, style="LabelGeneral.TLabel", textvariable=self.gameover_message_one, wraplength=380)
+        gameover_message_label_two = ttk.Label(self, style="LabelGeneral.TLabel", textvariable=self.gameover_message_two)
         play_button = ttk.Button(self, text="Play Hangman", command=
                                  lambda: controller.next_page(SettingsPage))
         quit_button = ttk.Button(self, text="Quit", command=controller.destroy)
+        leaderboard_button = ttk.Button(self, text="Leaderboard", command=
+                                        lambda: controller.next_page(LeaderboardPage))
 
         gameover_message_label_one.grid(row=0, column=0, columnspan=2, sticky="S")
         gameover_message_label_two.grid(row=1, column=0, columnspan=2, sticky="S")
         play_button.grid(row=2, column=0, sticky="E", padx=10, pady=30)
         quit_button.grid(row=2, column=1, sticky="W", padx=10, pady=30)
+        leaderboard_button.grid(row=3, column=0, columnspan=2)
 
-        print(play_button.winfo_class())
-
-        for button in [play_button, quit_button]:
+        for button in [play_button, quit_button, leaderboard_button]:
             button["style"] = "ButtonGeneral.TButton"
 
+    def show(self):
+        """
+        - displays the gameover messages of the round that just ended (blank on first launch)
+        """
+        message_one, message_two = self.controller.match.gameover_messages
+        self.gameover_message_one.set(message_one)
+        self.gameover_message_two.set(message_two)
+
 class SettingsPage(ttk.Frame):
 
     """
     SettingsPage does 3 things:
     1. takes the names for each player (Player 1 & 2 are the default)
     2. designates which player will be choosing the word via radiobutton selection
-    3. assigns the player names to a few internal variables that need to know which player is choosing and which is guessing.
+    3. assigns the player names to the match, which needs to know which player is choosing and which is guessing.
+    picking "Computer" starts a single-player game: Player 1 guesses a word drawn from the hangman_difficulty index at the chosen difficulty, and WordPage is skipped.
+    picking "Network" plays Player 1 against another window through hangman_server: "host:port" hosts a new session and Player 1 picks the word, "host:port/id" joins session id and Player 1 guesses.
     """
+    styles = ("LabelGeneral.TLabel", "EntryGeneral.TEntry", "ButtonGeneral.TButton", "LabelError.TLabel")
+    difficulty_index = hangman_difficulty.DifficultyIndex() #shared by every window. mapped on the first computer pick
 
     def __init__(self, container, controller, style, **kwargs):
         super().__init__(container, **kwargs)
 
-        #all SettingsPage variables as class variables.
-        SettingsPage.player_one_name = tk.StringVar(value="Player 1")
-        SettingsPage.player_two_name = tk.StringVar(value="Player 2")
-        SettingsPage.word_picker = tk.StringVar()
-        SettingsPage.word_guesser = tk.StringVar()
-        SettingsPage.error_message = tk.StringVar()
-        SettingsPage.enter_word_message = tk.StringVar()
-        SettingsPage.guesses_left = tk.IntVar(value=5)
-
-        self.rowconfigure((0,4), minsize=60)
-        self.rowconfigure((1,2,3,5), minsize=30)
+        #Tk variables for the SettingsPage widgets. the values themselves are kept in controller.match
+        self.controller = controller
+        self.player_one_name = tk.StringVar()
+        self.player_two_name = tk.StringVar()
+        self.word_picker = tk.StringVar()
+        self.error_message = tk.StringVar()
+        self.guesses_left = tk.IntVar()
+        self.phrase_mode = tk.BooleanVar()
+        self.difficulty = tk.StringVar()
+        self.alphabet = tk.StringVar()
+        self.network_address = tk.StringVar(value="127.0.0.1:8765") #kept between rounds, unlike the rest
+
+        self.rowconfigure((0,6), minsize=60)
+        self.rowconfigure((1,2,3,4,5,7), minsize=30)
         self.columnconfigure((0,1), minsize=150)
 
         #creating all widgets in SettingsPage in order of appearance
         player_names_label = ttk.Label(self, text="Player Names")
-        player_one_entry = ttk.Entry(self, width=15, textvariable=SettingsPage.player_one_name)
-        player_two_entry = ttk.Entry(self, width=15, textvariable=SettingsPage.player_two_name)
+        player_one_entry = ttk.Entry(self, width=15, textvariable=self.player_one_name)
+        player_two_entry = ttk.Entry(self, width=15, textvariable=self.player_two_name)
         guesses_label = ttk.Label(self, style="LabelGeneral.TLabel", text="Guesses:")
         guesses_entry = tk.Spinbox(
             self,
             width=3,
-            textvariable=SettingsPage.guesses_left,
-            from_=5,
-            to=15,
+            textvariable=self.guesses_left,
+            from_=hangman_engine.MIN_GUESSES,
+            to=hangman_engine.MAX_GUESSES,
             wrap=True)
+        phrase_mode_button = ttk.Checkbutton(self, text="Phrase mode", variable=self.phrase_mode)
+        difficulty_label = ttk.Label(self, text="Difficulty:")
+        difficulty_entry = ttk.Combobox(self, width=7, state="readonly", textvariable=self.difficulty, values=hangman_difficulty.LEVELS + (EVIL,))
+        alphabet_label = ttk.Label(self, text="Alphabet:")
+        alphabet_entry = ttk.Combobox(self, width=9, state="readonly", textvariable=self.alphabet, values=hangman_alphabets.names())
 
         select_label = ttk.Label(self, text="Word Picker")
 
         select_one = ttk.Radiobutton(
             self,
             text="",
-            variable=SettingsPage.word_picker,
+            variable=self.word_picker,
             value="Player 1")
 
         select_two = ttk.Radiobutton(
             self,
             text="",
-            variable=SettingsPage.word_picker,
+            variable=self.word_picker,
             value="Player 2")
 
-        confirm_settings_button = ttk.Button(self, style="ButtonGeneral.TButton", text="Confirm Settings", command=lambda:
-                                             SettingsPage.update_Word_Picker(controller))
+        select_computer = ttk.Radiobutton(
+            self,
+            text=COMPUTER,
+            variable=self.word_picker,
+            value=COMPUTER)
 
-        error_message_label_settings = ttk.Label(self, style="LabelError.TLabel", textvariable = SettingsPage.error_message)
+        select_network = ttk.Radiobutton(
+            self,
+            text=NETWORK,
+            variable=self.word_picker,
+            value=NETWORK)
+        network_entry = ttk.Entry(self, width=10, textvariable=self.network_address)
+
+        confirm_settings_button = ttk.Button(self, style="ButtonGeneral.TButton", text="Confirm Settings", command=lambda: self.update_Word_Picker())
 
-        for label in [player_names_label, select_label]:
+        error_message_label_settings = ttk.Label(self, style="LabelError.TLabel", textvariable = self.error_message)
+
+        for label in [player_names_label, select_label, difficulty_label, alphabet_label]:
             label["style"] = "LabelGeneral.TLabel"
 
         for field in [player_one_entry, player_two_entry]:
@@ -191,37 +339,179 @@ class SettingsPage(ttk.Frame):
         select_two.grid(row=2, column=1)
         guesses_label.grid(row=3, column=0, sticky="WS")
         guesses_entry.grid(row=3, column=0, sticky="ES")
-        confirm_settings_button.grid(row=4, column=0, columnspan=2, sticky="S")
-        error_message_label_settings.grid(row=5, column=0, columnspan=2, sticky="S")
-
-    def update_Word_Picker(controller, *args):
+        difficulty_label.grid(row=3, column=1, sticky="WS")
+        difficulty_entry.grid(row=3, column=1, sticky="ES")
+        phrase_mode_button.grid(row=4, column=0, sticky="WS")
+        select_computer.grid(row=4, column=1, sticky="S")
+        select_network.grid(row=5, column=1, sticky="WS")
+        network_entry.grid(row=5, column=1, sticky="ES")
+        alphabet_label.grid(row=5, column=0, sticky="WS")
+        alphabet_entry.grid(row=5, column=0, sticky="ES")
+        confirm_settings_button.grid(row=6, column=0, columnspan=2, sticky="S")
+        error_message_label_settings.grid(row=7, column=0, columnspan=2, sticky="S")
+
+    def show(self):
         """
-        - assigns player names to their sides based on radiobutton selection, creates a message from them, then calls next page. throws an error message if a radiobutton isn't selected.
+        - copies the new round's match into the widgets. no picker is selected yet.
+        """
+        match = self.controller.match
+        self.player_one_name.set(match.player_one)
+        self.player_two_name.set(match.player_two)
+        self.word_picker.set("")
+        self.error_message.set("")
+        self.guesses_left.set(match.guesses)
+        self.phrase_mode.set(match.phrase)
+        self.difficulty.set(match.difficulty)
+        self.alphabet.set(match.alphabet)
+
+    def update_Word_Picker(self, *args):
+        """
+        - assigns player names to their sides based on radiobutton selection, stores them and the other settings in the match, then calls next page. throws an error message if a radiobutton isn't selected.
         - tied to confirm_settings_button
         """
-        if SettingsPage.word_picker.get() == "Player 1":
-            SettingsPage.word_picker.set(SettingsPage.player_one_name.get()) #set word_picker equal to player name selected.
-            SettingsPage.word_guesser.set(SettingsPage.player_two_name.get()) #set word_guesser equal to other player
-            name = SettingsPage.word_picker.get()
-            message = name + ", enter your word"
-            SettingsPage.enter_word_message.set(message)
+        match = self.controller.match
+        match.player_one = self.player_one_name.get()
+        match.player_two = self.player_two_name.get()
+        self.controller.close_network() #confirming again drops a network session that's still waiting
+        match.network = None
 
-            controller.next_page(WordPage)
-            WordPage.enter_word_entry.focus()
+        if self.word_picker.get() == "Player 1":
+            match.word_picker, match.word_guesser = match.player_one, match.player_two #word_picker is the player selected, word_guesser the other one
 
+        elif self.word_picker.get() == "Player 2": #same logic, but flipped for player 2.
+            match.word_picker, match.word_guesser = match.player_two, match.player_one
 
-        elif SettingsPage.word_picker.get() == "Player 2": #same logic, but flipped for player 2.
-            SettingsPage.word_picker.set(SettingsPage.player_two_name.get())
-            SettingsPage.word_guesser.set(SettingsPage.player_one_name.get())
-            name = SettingsPage.word_picker.get()
-            message = name + ", enter your word"
-            SettingsPage.enter_word_message.set(message)
+        elif self.word_picker.get() == COMPUTER: #single player: player 1 guesses the computer's word
+            match.word_picker, match.word_guesser = COMPUTER, match.player_one
 
-            controller.next_page(WordPage)
-            WordPage.enter_word_entry.focus()
+        elif self.word_picker.get() == NETWORK: #sides are only known once the server pairs both players (network_joined)
+            pass
 
         else:
-            SettingsPage.error_message.set("Select which player will pick the word")
+            self.error_message.set("Select which player will pick the word")
+            return
+
+        match.guesses = self.guesses_left.get()
+        match.phrase = self.phrase_mode.get()
+        match.difficulty = self.difficulty.get()
+        match.alphabet = self.alphabet.get()
+        if self.word_picker.get() == NETWORK:
+            self.network_connect()
+            return
+        if match.word_picker == COMPUTER:
+            self.computer_pick()
+            return
+        self.controller.next_page(WordPage)
+
+    def network_connect(self):
+        """
+        - connects to the hangman_server in network_address and asks to host (the address alone) or join (address/id) a session.
+        - the replies come back through WindowMain.network_message() to the network_* methods below. the server
+        checks words with hangman_engine's English rules, so other alphabets are refused here.
+        """
+        match = self.controller.match
+        if match.alphabet != hangman_alphabets.DEFAULT:
+            self.error_message.set("Network games are English only")
+            return
+        address, slash, session = self.network_address.get().strip().partition("/")
+        host, colon, port = address.rpartition(":")
+        if not host or not port.isdigit() or (slash and not session.isdigit()):
+            self.error_message.set("Enter the server as host:port, or host:port/id to join")
+            return
+        client = self.controller.connect(host, int(port))
+        if slash:
+            match.network = "guesser"
+            client.send({"op": "join", "id": int(session), "name": match.player_one})
+        else:
+            match.network = "picker"
+            client.send({"op": "new", "name": match.player_one, "guesses": match.guesses, "phrase": match.phrase})
+        self.error_message.set("Connecting...")
+
+    def network_session(self, message):
+        self.error_message.set("Waiting for a guesser. Join with %s/%d" % (self.network_address.get().strip(), message["id"]))
+
+    def network_joined(self, message):
+        """
+        - both players are in. the host's guesses and phrase mode apply to both sides.
+        """
+        match = self.controller.match
+        match.word_picker, match.word_guesser = message["picker"], message["guesser"]
+        match.guesses, match.phrase = message["guesses"], message["phrase"]
+        if match.network == "picker":
+            self.controller.next_page(WordPage)
+        else:
+            self.error_message.set("Waiting for " + match.word_picker + " to pick the " + match.target_name)
+
+    def network_start(self, message):
+        """
+        - the guesser's window, once the picker's word is in. only its blank comes over the network.
+        """
+        self.controller.start_game(message["blank"])
+        self.controller.next_page(GamePage)
+
+    def network_error(self, message):
+        self.controller.close_network() #a refused new or join leaves nothing to keep, so Confirm starts again
+        self.error_message.set(message["message"])
+
+    def computer_pick(self):
+        """
+        - draws a word at the chosen difficulty (one record read from the mapped index), starts the game and raises GamePage.
+        - refuses if the index is missing or was scored against a different dictionary than the current words.idx.
+        - on Evil there's no word to draw: an adversary is built on a worker instead, and start_adversary() begins the game.
+        """
+        if self.controller.match.phrase:
+            self.error_message.set("The computer only picks single words")
+            return
+        if self.controller.match.alphabet != hangman_alphabets.DEFAULT: #the index is scored from the English words.idx
+            self.error_message.set("The computer only picks English words")
+            return
+        if self.controller.match.difficulty == EVIL:
+            if not WordPage.dictionary.available():
+                self.error_message.set("Evil mode needs a dictionary (words.idx)")
+                return
+            workers = self.controller.workers
+            if not workers.busy(SettingsPage):
+                workers.submit(self.build_adversary, group=SettingsPage, on_done=self.start_adversary, on_error=self.adversary_failed)
+            return
+        index = SettingsPage.difficulty_index
+        if index.stale():
+            index.close() #the index may have been rebuilt since it was mapped, so look at the file again
+            if index.stale():
+                self.error_message.set("Run hangman_difficulty.py build first")
+                return
+        word = index.pick(hangman_difficulty.LEVELS.index(self.controller.match.difficulty))
+        if word is None:
+            self.error_message.set("No words at that difficulty")
+            return
+        self.controller.start_game(word)
+        self.controller.next_page(GamePage)
+
+    def build_adversary(self):
+        """
+        - runs on a worker thread (NumPy's import and the first matrix for a length are the slow part). touches no Tk state.
+        """
+        import hangman_solver
+        dictionary = WordPage.dictionary
+        lengths = [length for length in EVIL_LENGTHS if dictionary.count(length)]
+        if not lengths:
+            raise ValueError("no dictionary words of %d-%d letters" % (EVIL_LENGTHS[0], EVIL_LENGTHS[-1]))
+        length = random.choices(lengths, weights=[dictionary.count(length) for length in lengths])[0]
+        if GamePage.solver is None:
+            GamePage.solver = hangman_solver.Solver(dictionary)
+        return hangman_solver.Adversary(GamePage.solver, length)
+
+    def start_adversary(self, adversary):
+        self.controller.match.adversary = adversary
+        self.controller.start_game(None)
+        self.controller.next_page(GamePage)
+
+    def adversary_failed(self, error):
+        if isinstance(error, ImportError):
+            self.error_message.set("Evil mode needs NumPy installed")
+        elif isinstance(error, (OSError, ValueError)):
+            self.error_message.set("Dictionary could not be loaded")
+        else:
+            raise error
 
 class WordPage(ttk.Frame):
 
@@ -231,6 +521,8 @@ class WordPage(ttk.Frame):
     2. stores that word
     3. creates the word_blanks, one to be used for display on GamePage and the other for internal operations
     """
+    styles = ("LabelGeneral.TLabel", "ButtonGeneral.TButton", "LabelError.TLabel")
+    dictionary = hangman_dictionary.Dictionary() #shared by every window. opened and memory-mapped on the first lookup, not here
 
     def __init__(self, container, controller, style, **kwargs):
         super().__init__(container, **kwargs)
@@ -239,55 +531,160 @@ class WordPage(ttk.Frame):
         self.rowconfigure((0,2,3), minsize=60)
         self.rowconfigure((4), minsize=30)
 
-        WordPage.game_word = tk.StringVar()
-        WordPage.alphabet = tk.StringVar(value=string.ascii_lowercase.upper())
-        WordPage.error_message_wordpage = tk.StringVar(value="x")
-        WordPage.word_blank = tk.StringVar()
-        WordPage.word_blank_mirror = []
+        self.controller = controller
+        self.game_word = tk.StringVar()
+        self.enter_word_message = tk.StringVar()
+        self.error_message_wordpage = tk.StringVar()
+        self.check_dictionary = tk.BooleanVar(value=False)
+        self.pending_word = None #in a network game, the word sent to the server and waiting for its go-ahead
 
-        enter_word_label_one = ttk.Label(self, style="LabelGeneral.TLabel", textvariable=SettingsPage.enter_word_message)
+        enter_word_label_one = ttk.Label(self, style="LabelGeneral.TLabel", textvariable=self.enter_word_message)
         enter_word_label_two = ttk.Label(self, style="LabelGeneral.TLabel", text="Keep it hidden")
-        WordPage.enter_word_entry = ttk.Entry(self, width=20, textvariable=WordPage.game_word)
-        confirm_word_button = ttk.Button(self, width=10, style="ButtonGeneral.TButton", text="Confirm Word", command=
-                                         lambda: WordPage.WordPage_func(controller))
-        error_message_label_wordpage = ttk.Label(self, style="LabelError.TLabel", textvariable = WordPage.error_message_wordpage)
+        self.enter_word_entry = ttk.Entry(self, width=20, textvariable=self.game_word)
+        confirm_word_button = ttk.Button(self, width=10, style="ButtonGeneral.TButton", text="Confirm Word", command=lambda: self.WordPage_func())
+        error_message_label_wordpage = ttk.Label(self, style="LabelError.TLabel", textvariable = self.error_message_wordpage)
+        check_dictionary_button = ttk.Checkbutton(self, text="Check dictionary", variable=self.check_dictionary)
+        if not WordPage.dictionary.available(): #no words.idx built, so there's nothing to check against
+            check_dictionary_button.state(["disabled"])
+        self.progress = ttk.Progressbar(self, mode="indeterminate", length=150) #only gridded while a lookup runs
 
         enter_word_label_one.grid(row=0, column=0, sticky="S")
         enter_word_label_two.grid(row=1, column=0, sticky="S")
-        WordPage.enter_word_entry.grid(row=2, column=0, sticky="S")
+        self.enter_word_entry.grid(row=2, column=0, sticky="S")
         confirm_word_button.grid(row=3, column=0, sticky="S")
         error_message_label_wordpage.grid(row=4, column=0, sticky="S")
+        check_dictionary_button.grid(row=5, column=0, sticky="S")
+
+    def show(self):
+        match = self.controller.match
+        self.enter_word_message.set(match.word_picker + ", enter your " + match.target_name)
+        self.game_word.set("")
+        self.error_message_wordpage.set("")
+        self.pending_word = None
+        self.set_busy(False)
+        self.enter_word_entry.focus()
+
+    def set_busy(self, busy):
+        if busy:
+            self.progress.grid(row=6, column=0, pady=5)
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.progress.grid_forget()
 
-
-    def WordPage_func(controller, *args):
+    def WordPage_func(self, *args):
         """
         - checks validity of entered word. if not valid, throws an error message to a label and does nothing. if valid, creates a word blank using create_word_blank() and raises GamePage. if player hits button without entering anything, throws another error and does nothing.
-        - requires controller parameter to use next_page()
+        - when "Check dictionary" is ticked, the word must also be in the hangman_dictionary index. the lookup (which opens and maps the file the first time) runs on a worker, and dictionary_checked() carries on once it's back.
+        - in phrase mode the target can be a whole sentence or passage. spaces and punctuation are allowed and start out revealed.
+        - input is normalized with the match's hangman_alphabets table (case, accents, script variants), then checked against its letter set.
         - tied to confirm_word_button
         """
-        if len(WordPage.game_word.get()) > 1:
-            word = WordPage.game_word.get().upper()
-            for letter in word:
-                if letter not in WordPage.alphabet.get():
-                    WordPage.error_message_wordpage.set("Your word can only contain letters") #error message
-                    return
+        match = self.controller.match
+        alphabet = hangman_alphabets.get(match.alphabet)
+        if match.phrase:
+            word = alphabet.normalize_phrase(self.game_word.get())
+            error = alphabet.validate_phrase(word)
+        else:
+            word = alphabet.normalize(self.game_word.get())
+            error = alphabet.validate_word(word) #same length and letters-only rules, checked without going through Tcl
+        if error is not None:
+            self.error_message_wordpage.set(error) #error message
+            return
 
-            WordPage.create_word_blank(word) #creates word blank for display and internal operations
-            controller.next_page(GamePage) #raises GamePage
-            GamePage.player_guess_entry.focus()
+        #words.idx is English, so other alphabets have no dictionary to check against
+        if self.check_dictionary.get() and not match.phrase and match.alphabet == hangman_alphabets.DEFAULT:
+            workers = self.controller.workers
+            if workers.busy(WordPage): #already checking a word
+                return
+            self.error_message_wordpage.set("")
+            self.set_busy(True)
+            workers.submit(WordPage.dictionary.__contains__, word, group=WordPage,
+                           on_done=lambda known: self.dictionary_checked(word, known),
+                           on_error=self.dictionary_failed)
+            return
 
-        else:
-            WordPage.error_message_wordpage.set("Enter a word at least 2 letters long") #error message
+        self.submit_word(word)
+
+    def dictionary_checked(self, word, known):
+        """
+        - UI thread, once the worker's lookup is back. starts the round if the word is known.
+        """
+        self.set_busy(False)
+        if not known:
+            self.error_message_wordpage.set("That word isn't in the dictionary")
             return
+        self.submit_word(word)
+
+    def dictionary_failed(self, error):
+        self.set_busy(False)
+        if not isinstance(error, (OSError, ValueError)):
+            raise error
+        self.error_message_wordpage.set("Dictionary could not be loaded")
 
-    def create_word_blank(game_word):
+    def submit_word(self, word):
         """
-        - creates two word blanks from the game_word, one for display and the other for game operations.
-        - there are two because I couldn't find an easy way to convert StringVar() contents from a string to a list. Each time you .set() and .get() the word_blank to update it, the list characters are interpreted as a string. By using two, a word_blank and word_blank_mirror, we can do all the manipulations with the mirror and then .set(word_blank_mirror) without needing to .get() from the original.
+        - starts the round with word and raises GamePage. in a network game the server checks the word first, and network_start() carries on once it has.
         """
-        WordPage.word_blank.set(["_" for i in range(0, len(game_word))]) #used for display
-        WordPage.word_blank_mirror = ["_" for i in range(0, len(game_word))] #used for operations
-        return
+        if self.controller.match.network == "picker":
+            if self.pending_word is None:
+                self.pending_word = word
+                self.set_busy(True)
+                self.controller.client.send({"op": "word", "word": word})
+            return
+        self.create_word_blank(word) #creates word blank for display and internal operations
+        self.controller.next_page(GamePage) #raises GamePage
+
+    def network_start(self, message):
+        word, self.pending_word = self.pending_word, None
+        self.set_busy(False)
+        self.create_word_blank(word)
+        self.controller.next_page(GamePage)
+
+    def network_error(self, message):
+        self.pending_word = None
+        self.set_busy(False)
+        self.error_message_wordpage.set(message["message"])
+
+    def create_word_blank(self, game_word):
+        """
+        - starts the hangman_engine.GameState for the round, which builds the letter -> positions index once.
+        - the game's blank list is the word_blank_mirror used for operations; GamePage joins it into its word_blank for display.
+        """
+        self.controller.start_game(game_word)
+
+class Gallows(tk.Canvas):
+    """
+    the gallows drawing on GamePage. every part is created once, hidden, when the page is built.
+    show() only flips the state of the parts between the stage on screen and the new one, so a wrong guess is one or
+    a few itemconfigure calls and Tk repaints just that corner of the canvas at its next idle, in the same frame.
+    nothing is deleted or recreated, which keeps the traffic to a remote X server down to a few small requests.
+    """
+    def __init__(self, container, **kwargs):
+        super().__init__(container, width=100, height=150, highlightthickness=0, **kwargs)
+        self.parts = []
+        for shape, coords in GALLOWS_PARTS:
+            create = self.create_oval if shape == "oval" else self.create_line
+            self.parts.append(create(*coords, width=2, state="hidden"))
+        self.shown = 0 #parts currently visible
+
+    def stage(self, misses, guesses):
+        """
+        - parts to show after misses out of guesses. rounds up, so the last miss always completes the drawing whatever the 5-15 setting.
+        """
+        if guesses <= 0:
+            return len(self.parts)
+        return min(len(self.parts), -(-misses * len(self.parts) // guesses))
+
+    def show(self, misses, guesses):
+        stage = self.stage(misses, guesses)
+        if stage > self.shown:
+            for item in self.parts[self.shown:stage]:
+                self.itemconfigure(item, state="normal")
+        elif stage < self.shown: #a new round
+            for item in self.parts[stage:self.shown]:
+                self.itemconfigure(item, state="hidden")
+        self.shown = stage
 
 class GamePage(ttk.Frame):
     """
@@ -300,16 +697,26 @@ class GamePage(ttk.Frame):
     3. after each guessing round, game_over_check() checks if a player has won. This happens when guesses_left = 0 or the word_blank = game_word.
     4. two gameover_messages are created, the StartPage is recalled, and these messages are displayed there declaring the winner.
     """
+    styles = ("LabelGeneral.TLabel", "DisplayGeneral.TLabel", "WordBlank.TLabel", "ButtonGeneral.TButton", "LabelError.TLabel", "LabelCorrect.TLabel")
+    solver = None #hangman_solver.Solver shared by every window, created on the first Hint press so NumPy is only needed for hints
 
     def __init__(self, container, controller, style, **kwargs):
         super().__init__(container, **kwargs)
 
-        #variables with "_mirror" suffix are used to get around .get() complications. _mirror vars are used in program operations, and then passed to .set() for display to the UI.
-        GamePage.letters_guessed = tk.StringVar()
-        GamePage.letters_guessed_mirror = []
-        GamePage.player_guess = tk.StringVar()
-        GamePage.error_message_gamepage = tk.StringVar()
-        GamePage.correct_ans = tk.StringVar()
+        #display variables only. the round itself is controller.match.game, whose blank and guessed_order lists are the "mirrors" these get .set() from
+        self.controller = controller
+        self.letters_guessed = tk.StringVar()
+        self.word_blank = tk.StringVar()
+        self.guesses_left = tk.IntVar()
+        self.player_guess = tk.StringVar()
+        self.error_message_gamepage = tk.StringVar()
+        self.correct_ans = tk.StringVar()
+        self.hinter = None
+        self.guess_pending = False #True while a network guess is waiting for the server
+        self.refresh_pending = False #True while a refresh_display() is queued with after_idle
+        self.rendered_game = None #what word_blank and letters_guessed were last .set() from, so unchanged text is never rebuilt
+        self.rendered_hidden = -1
+        self.rendered_guesses = -1
 
         self.columnconfigure((0,1), minsize=150)
         self.rowconfigure((0,4), minsize=60)
@@ -317,43 +724,63 @@ class GamePage(ttk.Frame):
 
         #all widgets in the GamePage
         letters_guessed_label = ttk.Label(self, style="LabelGeneral.TLabel", text="Letters Guessed")
-        letters_guessed_display = ttk.Label(self, style="DisplayGeneral.TLabel", textvariable=GamePage.letters_guessed)
+        letters_guessed_display = ttk.Label(self, style="DisplayGeneral.TLabel", textvariable=self.letters_guessed)
         guesses_left_label = ttk.Label(self, style="LabelGeneral.TLabel", text="Guesses left")
-        guesses_left_display = ttk.Label(self, style="DisplayGeneral.TLabel", textvariable=SettingsPage.guesses_left)
+        guesses_left_display = ttk.Label(self, style="DisplayGeneral.TLabel", textvariable=self.guesses_left)
         player_guess_label = ttk.Label(self, style="LabelGeneral.TLabel", text="Guess a letter:")
-        GamePage.player_guess_entry = ttk.Entry(self, width=2, textvariable=GamePage.player_guess)
-        word_blank_display = ttk.Label(self, style="WordBlank.TLabel", textvariable=WordPage.word_blank)
+        self.player_guess_entry = ttk.Entry(self, width=2, textvariable=self.player_guess)
+        word_blank_display = ttk.Label(self, style="WordBlank.TLabel", textvariable=self.word_blank, wraplength=380) #wraps long phrases
         # ----- separating for visibility - has most of functionality
-        player_guess_submit = ttk.Button(self, width=7, style="ButtonGeneral.TButton", text="Submit", command=
-                                         lambda: GamePage.GamePage_func(controller))
+        player_guess_submit = ttk.Button(self, width=7, style="ButtonGeneral.TButton", text="Submit", command=lambda: self.GamePage_func())
         # -----
-        GamePage.error_label_gamepage_one = ttk.Label(self, style="LabelError.TLabel", textvariable=GamePage.error_message_gamepage)
-        GamePage.error_label_gamepage_two = ttk.Label(self, style="LabelCorrect.TLabel", textvariable=GamePage.correct_ans)
+        hint_button = ttk.Button(self, width=7, style="ButtonGeneral.TButton", text="Hint", command=lambda: self.give_hint())
+        self.error_label_gamepage_one = ttk.Label(self, style="LabelError.TLabel", textvariable=self.error_message_gamepage)
+        self.error_label_gamepage_two = ttk.Label(self, style="LabelCorrect.TLabel", textvariable=self.correct_ans)
+        self.progress = ttk.Progressbar(self, mode="indeterminate", length=100) #only gridded while a hint is being worked out
+        self.gallows = Gallows(self)
 
         #placement of all widgets in GamePage
         letters_guessed_label.grid(row=0, column=0, sticky="WS")
         letters_guessed_display.grid(row=1, column=0, sticky="WS")
         player_guess_label.grid(row=0, column=1, sticky="WS")
-        GamePage.player_guess_entry.grid(row=1, column=1,sticky="WS")
+        self.player_guess_entry.grid(row=1, column=1,sticky="WS")
         player_guess_submit.grid(row=1, column=1, sticky="ES")
+        hint_button.grid(row=3, column=1, sticky="ES")
         guesses_left_label.grid(row=2, column=0, sticky="WS")
         guesses_left_display.grid(row=3, column=0, sticky="WS")
+        self.gallows.grid(row=0, column=2, rowspan=4)
         word_blank_display.grid(row=4, column=0, columnspan=3, sticky="S")
-        GamePage.error_label_gamepage_one.grid(row=5, column=0, columnspan=3, sticky="S")
-        GamePage.error_label_gamepage_two.grid(row=5, column=0, columnspan=3, sticky="S")
+        self.error_label_gamepage_one.grid(row=5, column=0, columnspan=3, sticky="S")
+        self.error_label_gamepage_two.grid(row=5, column=0, columnspan=3, sticky="S")
 
-    def GamePage_func(controller, *args):
+    def show(self):
+        """
+        - displays the new round's blank and guesses, and clears everything left over from the last round
+        """
+        self.hinter = None #built on the first Hint press of the round
+        self.guess_pending = False
+        self.set_busy(False)
+        self.player_guess.set("")
+        self.error_message_gamepage.set("")
+        self.correct_ans.set("")
+        match = self.controller.match
+        self.guesses_left.set(match.game.guesses_left)
+        self.gallows.show(match.game.misses, match.guesses)
+        self.refresh_display()
+        self.player_guess_entry.focus()
+
+    def GamePage_func(self, *args):
         """
         - parent function that calls two other functions: check_player_guess() and next_page().
         - tied to player_guess_submit button
         """
         game_end = False
-        game_end = GamePage.check_player_guess() #returns True when a player wins
+        game_end = self.check_player_guess() #returns True when a player wins
 
         if game_end == True:
-            controller.next_page(StartPage) #recalls StartPage when a player wins
+            self.controller.next_page(StartPage) #recalls StartPage when a player wins
 
-    def check_player_guess():
+    def check_player_guess(self):
 
         """
         handles all core game functionality in these steps:
@@ -369,104 +796,327 @@ class GamePage(ttk.Frame):
                 3. calls gameover_check_wrong to check for loss
 
         this process repeats until one of the gameover_check functions returns game_end = True
+        the rules themselves live in hangman_engine.guess(); this only updates the widgets from its result.
+        against the Evil adversary, a valid new letter is first handed to it to decide where (if anywhere) the letter is.
+        in a network game the guess goes to the server instead (send_guess), and network_result() shows it once it's played.
         """
 
-        word = WordPage.game_word.get().upper() #get the game_word as word
-        guess = GamePage.player_guess.get().upper() #get the player_guess as guess
+        match = self.controller.match
+        game = match.game
+        guess = hangman_alphabets.get(match.alphabet).normalize(self.player_guess.get()) #get the player_guess as guess, in the alphabet's canonical form
+        if match.network is not None:
+            self.send_guess(guess)
+            return None
+        adversary = match.adversary
+        if adversary is not None and game.bits.get(guess) is not None and not game.is_guessed(guess):
+            hangman_engine.commit(game, guess, adversary.respond(guess)) #the adversary decides where the letter is, then the engine applies it as usual
+        result = hangman_engine.guess(game, guess)
+        if adversary is not None and game.over:
+            game.word = adversary.word() #settles on a word only now, for the gameover message and stats
+        word = game.word
+        self.record_guess(guess, result)
+        self.show_result(guess, result)
+
+        if result == hangman_engine.CORRECT:
+            game_end = self.gameover_check_correct(word) #checks for win
+            return game_end
+        elif result == hangman_engine.WRONG:
+            game_end = self.gameover_check_wrong(word) #checks for loss
+            return game_end
+
+    def show_result(self, guess, result):
+        """
+        - updates the widgets for the result hangman_engine.guess() gave, for a local guess or one the server played
+        """
 
         #initial validity check of player_guess
-        if (len(guess) == 0) or (len(guess) > 1) or (guess not in WordPage.alphabet.get()) or (guess in GamePage.letters_guessed.get()):
-
-            GamePage.error_label_gamepage_two.grid_forget()
-            GamePage.error_label_gamepage_one.grid(row=5, column=0, columnspan=3, sticky="S")
-            GamePage.error_message_gamepage.set("Guess failed. Must be a single letter you've yet to guess.")
-
-        elif guess in word:
-            GamePage.mark_guess(guess) #append guess to letters_guessed
-            GamePage.update_word_blank(guess, word) #updates both word blanks
-            GamePage.error_label_gamepage_one.grid_forget()
-            GamePage.error_label_gamepage_two.grid(row=5, column=0, columnspan=3, sticky="S")
-            GamePage.correct_ans.set("CORRECT") #informs users that guess was correct
-            GamePage.error_message_gamepage.set("")
-            GamePage.player_guess.set("") #resets player_guess_entry
-            GamePage.player_guess_entry.focus() #rehighlights guess entry field
-            game_end = GamePage.gameover_check_correct(word) #checks for win
-            return game_end
+        if result == hangman_engine.INVALID or result == hangman_engine.REPEATED:
+
+            self.error_label_gamepage_two.grid_forget()
+            self.error_label_gamepage_one.grid(row=5, column=0, columnspan=3, sticky="S")
+            self.error_message_gamepage.set("Guess failed. Must be a single letter you've yet to guess.")
+
+        elif result == hangman_engine.CORRECT:
+            self.mark_guess(guess) #append guess to letters_guessed
+            self.update_word_blank(guess, self.controller.match.game.word) #updates both word blanks
+            self.error_label_gamepage_one.grid_forget()
+            self.error_label_gamepage_two.grid(row=5, column=0, columnspan=3, sticky="S")
+            self.correct_ans.set("CORRECT") #informs users that guess was correct
+            self.error_message_gamepage.set("")
+            self.player_guess.set("") #resets player_guess_entry
+            self.player_guess_entry.focus() #rehighlights guess entry field
+
+        elif result == hangman_engine.WRONG:
+            self.mark_guess(guess)
+            self.update_guesses_left() #decrements guesses_left
+            self.error_label_gamepage_two.grid_forget()
+            self.error_label_gamepage_one.grid(row=5, column=0, columnspan=3, sticky="S")
+            self.error_message_gamepage.set("WRONG") #informs users of wrong guess
+            self.correct_ans.set("")
+            self.player_guess.set("")
+            self.player_guess_entry.focus()
+
+    def record_guess(self, guess, result):
+        """
+        - logs a valid guess, unless the round isn't being logged: a replay, the Evil adversary's open word, or the guessing side of a network game
+        """
+        match = self.controller.match
+        if (self.controller.recording and match.adversary is None and match.network != "guesser"
+                and (result == hangman_engine.CORRECT or result == hangman_engine.WRONG)):
+            self.controller.game_log.guess(guess, result)
 
-        elif guess not in word:
-            GamePage.mark_guess(guess)
-            GamePage.update_guesses_left() #decrements guesses_left
-            GamePage.error_label_gamepage_two.grid_forget()
-            GamePage.error_label_gamepage_one.grid(row=5, column=0, columnspan=3, sticky="S")
-            GamePage.error_message_gamepage.set("WRONG") #informs users of wrong guess
-            GamePage.correct_ans.set("")
-            GamePage.player_guess.set("")
-            GamePage.player_guess_entry.focus()
-            game_end = GamePage.gameover_check_wrong(word) #checks for loss
-            return game_end
+    def send_guess(self, guess):
+        """
+        - network game: only the guesser's window sends guesses, one at a time. a guess that would fail anyway is refused
+        here; anything else waits for the server, and network_result() shows it on both windows.
+        """
+        match = self.controller.match
+        game = match.game
+        if match.network == "picker":
+            self.show_error("Waiting for " + match.word_guesser + " to guess.")
+            return
+        if self.guess_pending:
+            return
+        if len(guess) != 1 or game.bits.get(guess) is None or game.is_guessed(guess):
+            self.show_result(guess, hangman_engine.INVALID)
+            return
+        self.guess_pending = True
+        self.player_guess.set("")
+        self.controller.client.send({"op": "guess", "letter": guess})
+
+    def network_result(self, message):
+        """
+        - a guess the server has played. the guesser's window doesn't know the word, so it learns where the letter is from
+        the new blank (hangman_engine.commit, as with the Evil adversary) and both sides then apply it with hangman_engine.guess.
+        """
+        match = self.controller.match
+        game = match.game
+        letter = message["letter"]
+        self.guess_pending = False
+        if match.network == "guesser":
+            hangman_engine.commit(game, letter, [i for i, char in enumerate(message["blank"]) if char == letter])
+        result = hangman_engine.guess(game, letter)
+        self.record_guess(letter, result)
+        self.show_result(letter, result)
+
+    def network_over(self, message):
+        """
+        - the server has ended the round. the word is revealed to the guesser's window, and the gameover messages are set as for a local game.
+        """
+        word = message["word"]
+        self.controller.match.game.word = word
+        self.controller.close_network()
+        if not self.gameover_check_correct(word):
+            self.gameover_check_wrong(word)
+        self.controller.next_page(StartPage)
+
+    def network_error(self, message):
+        self.guess_pending = False
+        self.show_error(message["message"])
+
+    def give_hint(self):
+        """
+        - tied to hint_button
+        - suggests the next letter from the dictionary words matching the word blank and the letters guessed so far. the hinter keeps its candidates between presses, so each press only applies the guesses made since the last one.
+        - the search runs on a worker (find_hint) with a snapshot of the blank and guesses, so the window keeps responding while the dictionary loads. show_hint() displays the result.
+        """
+        match = self.controller.match
+        if match.game is None:
+            return
+        if match.phrase:
+            self.show_error("Hints only work for single words.")
+            return
+        if match.alphabet != hangman_alphabets.DEFAULT: #the solver reads the English words.idx
+            self.show_error("Hints only work for English words.")
+            return
+        workers = self.controller.workers
+        if workers.busy(GamePage): #a hint is already on its way
+            return
+        if not WordPage.dictionary.available():
+            self.show_error("Hints need a dictionary (words.idx).")
+            return
 
-    def mark_guess(guess):
+        game = match.game
+        self.set_busy(True)
+        workers.submit(self.find_hint, self.hinter, list(game.blank), list(game.guessed_order),
+                       group=GamePage, pass_task=True, on_done=self.show_hint, on_error=self.hint_failed,
+                       on_progress=self.show_progress)
+
+    def find_hint(self, hinter, blank, letters_guessed, task):
+        """
+        - runs on a worker thread. touches no Tk state; returns (hinter, letter) for show_hint().
+        """
+        import hangman_solver #NumPy's import is slow too, so it happens here rather than on the UI thread
+        if hinter is None:
+            task.report("Loading dictionary...")
+            if GamePage.solver is None:
+                GamePage.solver = hangman_solver.Solver(WordPage.dictionary)
+            hinter = hangman_solver.Hinter(GamePage.solver, len(blank))
+        return hinter, hinter.hint(blank, letters_guessed)
+
+    def show_hint(self, result):
+        self.set_busy(False)
+        self.hinter, letter = result #kept only now, so a cancelled search never leaves its hinter behind
+        if letter is None:
+            self.show_error("No dictionary word fits. You're on your own.")
+            return
+        self.error_label_gamepage_one.grid_forget()
+        self.error_label_gamepage_two.grid(row=5, column=0, columnspan=3, sticky="S")
+        self.correct_ans.set("Hint: try " + letter)
+        self.player_guess_entry.focus()
+
+    def hint_failed(self, error):
+        self.set_busy(False)
+        if isinstance(error, ImportError):
+            self.show_error("Hints need NumPy installed.")
+        elif isinstance(error, (OSError, ValueError)):
+            self.show_error("Dictionary could not be loaded")
+        else:
+            raise error
+
+    def show_progress(self, message):
+        self.error_label_gamepage_one.grid_forget()
+        self.error_label_gamepage_two.grid(row=5, column=0, columnspan=3, sticky="S")
+        self.correct_ans.set(message)
+
+    def set_busy(self, busy):
+        if busy:
+            self.progress.grid(row=2, column=1, sticky="E")
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.progress.grid_forget()
+
+    def show_error(self, message):
+        self.error_label_gamepage_two.grid_forget()
+        self.error_label_gamepage_one.grid(row=5, column=0, columnspan=3, sticky="S")
+        self.error_message_gamepage.set(message)
+
+    def mark_guess(self, guess):
         """
         - called in check_player_guess()
-        - takes player_guess and appends to letters_guessed_mirror, which gets .set() to letters_guessed for UI.
+        - the engine has already recorded the guess in game.guessed_order; this queues the letters_guessed display update with refresh_display().
         """
-        GamePage.letters_guessed_mirror.append(guess)
-        GamePage.letters_guessed.set(GamePage.letters_guessed_mirror)
+        self.schedule_refresh()
 
-    def update_word_blank(guess, word):
+    def update_word_blank(self, guess, word):
         """
         - called in check_player_guess()
-        - updates both word blanks. cycles through each letter in game_word by index. word_blank_mirror gets .set() to word_blank. requires both the player_guess and game_word
+        - the engine has already filled in only the positions guess reveals (from its letter -> positions index), so all that's left is queueing a display refresh.
         """
-        for i in range(0, len(word)):
-            if word[i] == guess:
-                WordPage.word_blank_mirror[i] = guess
+        self.schedule_refresh()
 
-        WordPage.word_blank.set(WordPage.word_blank_mirror)
+    def schedule_refresh(self):
+        """
+        - queues refresh_display() with after_idle. guesses that land before Tk goes idle share one refresh, so a long phrase is rendered once per batch rather than once per change.
+        """
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.after_idle(self.refresh_display)
 
-    def update_guesses_left():
+    def refresh_display(self):
+        """
+        - .set()s word_blank and letters_guessed from the game's blank and guessed_order lists
+        - each is only rebuilt when it has changed: the blank when a letter is revealed (game.hidden drops), letters_guessed when a guess is added. a wrong guess never re-renders a long phrase.
+        """
+        self.refresh_pending = False
+        game = self.controller.match.game
+        if game is None:
+            return
+        new_game = game is not self.rendered_game
+        if new_game or game.hidden != self.rendered_hidden:
+            self.word_blank.set(" ".join(game.blank))
+        if new_game or len(game.guessed_order) != self.rendered_guesses:
+            self.letters_guessed.set(" ".join(game.guessed_order))
+        self.rendered_game, self.rendered_hidden, self.rendered_guesses = game, game.hidden, len(game.guessed_order)
+
+    def update_guesses_left(self):
         """
         - called in check_player_guess()
-        - decrements guesses_left by 1
+        - shows the engine's decremented guesses_left and draws the next gallows stage straight away, not via after_idle, so both land in the repaint that follows this guess
         """
-        num = SettingsPage.guesses_left.get()
-        num = num - 1
-        SettingsPage.guesses_left.set(num)
+        match = self.controller.match
+        self.guesses_left.set(match.game.guesses_left)
+        self.gallows.show(match.game.misses, match.guesses)
 
-    def gameover_check_wrong(word):
+    def gameover_check_wrong(self, word):
         """
         - called in check_player_guess() after wrong guess is made
         - returns game_end = True if guesser runs out of guesses
         """
-        if SettingsPage.guesses_left.get() == 0:
+        match = self.controller.match
+        if match.game.lost:
             #create gameover messages
-            winner_name, loser_name = SettingsPage.word_picker.get(), SettingsPage.word_guesser.get()
-            message_one = "The word was " + word
+            winner_name, loser_name = match.word_picker, match.word_guesser
+            message_one = "The " + match.target_name + " was " + word
             message_two = loser_name + " is out of guesses. " + winner_name + " WINS!"
 
-            #.sets() each message
-            StartPage.gameover_message_two.set(message_two)
-            StartPage.gameover_message_one.set(message_one)
+            #stores each message for StartPage to display, and queues the result for the stats writer thread
+            match.gameover_messages = (message_one, message_two)
+            if self.controller.recording and match.network != "guesser": #the picker's window records a network game
+                self.controller.stats.record_match(match)
             game_end = True
             return game_end #ends the game and triggers next_page()
 
-    def gameover_check_correct(word):
+    def gameover_check_correct(self, word):
         """
         called in check_player_guess() after correct guess
         - returns game_end = True if the guessers completes the word with guesses remaining
         """
-        if list(word) == WordPage.word_blank_mirror:
+        match = self.controller.match
+        if match.game.won:
             #create gameover messages
-            winner_name, loser_name = SettingsPage.word_guesser.get(), SettingsPage.word_picker.get()
-            message_one = "The word was " + word
+            winner_name, loser_name = match.word_guesser, match.word_picker
+            message_one = "The " + match.target_name + " was " + word
             message_two = winner_name + " WINS!"
 
-            #.sets() each message
-            StartPage.gameover_message_two.set(message_two)
-            StartPage.gameover_message_one.set(message_one)
+            #stores each message for StartPage to display, and queues the result for the stats writer thread
+            match.gameover_messages = (message_one, message_two)
+            if self.controller.recording and match.network != "guesser": #the picker's window records a network game
+                self.controller.stats.record_match(match)
             game_end = True
             return game_end
 
-root = WindowMain()
+class LeaderboardPage(ttk.Frame):
+    """
+    LeaderboardPage shows the top players from hangman_stats, read fresh from the indexed players table each time it's raised.
+    """
+    styles = ("LabelGeneral.TLabel", "ButtonGeneral.TButton")
+    columns = (("name", "Player", 90), ("wins", "W", 35), ("losses", "L", 35), ("picker", "Picker W-L", 70),
+               ("guesser", "Guesser W-L", 75), ("misses", "Misses", 50), ("streak", "Best", 40))
+
+    def __init__(self, container, controller, style, **kwargs):
+        super().__init__(container, **kwargs)
+
+        self.controller = controller
+        self.columnconfigure(0, weight=1)
 
-root.mainloop()
+        leaderboard_label = ttk.Label(self, style="LabelGeneral.TLabel", text="Leaderboard")
+        self.table = ttk.Treeview(self, columns=[name for name, heading, width in LeaderboardPage.columns], show="headings", height=8)
+        for name, heading, width in LeaderboardPage.columns:
+            self.table.heading(name, text=heading)
+            self.table.column(name, width=width, anchor="center")
+        back_button = ttk.Button(self, style="ButtonGeneral.TButton", text="Back", command=
+                                 lambda: controller.next_page(StartPage))
+
+        leaderboard_label.grid(row=0, column=0, sticky="S", pady=5)
+        self.table.grid(row=1, column=0)
+        back_button.grid(row=2, column=0, pady=10)
+
+    def show(self):
+        self.table.delete(*self.table.get_children())
+        try:
+            rows = self.controller.stats.leaderboard()
+        except hangman_stats.sqlite3.Error:
+            rows = []
+        for name, wins, losses, picker_wins, picker_losses, guesser_wins, guesser_losses, misses, streak, best_streak in rows:
+            self.table.insert("", "end", values=(name, wins, losses, "%d-%d" % (picker_wins, picker_losses),
+                                                 "%d-%d" % (guesser_wins, guesser_losses),
+                                                 "-" if misses is None else "%.1f" % misses, best_streak))
+
+def main():
+    root = WindowMain()
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
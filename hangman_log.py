@@ -0,0 +1,272 @@
+"""
+compact binary log of every game played, and tools to replay it.
+
+each record is a length prefix followed by the payload. the prefix is one byte, or 0xFF then a uint32 for
+payloads of 255 bytes or more. the payload's first byte is the event type, and the next four are the session: an id
+picked by each GameLogger, so the events of two windows writing to one file can be told apart.
+- GAME:  session, start time (float64), guesses, phrase flag, then picker, guesser, word and alphabet name as
+  uint32-length UTF-8 (a phrase can be a whole passage)
+- GUESS: session, result (hangman_engine constant), milliseconds since the session's game started (uint32), letter as UTF-8
+- END:   session. written when a logger closes, so its last game is complete
+
+a guess costs about a dozen bytes and one buffered write. reading is a generator over a buffered file, and the
+replay pipeline only holds the game in progress of each open session, so logs of any size stream through in
+constant memory.
+
+    python hangman_log.py summary games.log
+    python hangman_log.py replay games.log --speed 4
+"""
+import argparse
+import os
+import random
+import struct
+import time
+
+import hangman_alphabets
+import hangman_engine
+
+LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hangman_games.log")
+
+GAME, GUESS, END = 1, 2, 3
+GAME_HEADER = struct.Struct("<BIdBB")
+GUESS_HEADER = struct.Struct("<BIBI")
+END_RECORD = struct.Struct("<BI")
+LENGTH = struct.Struct("<I")
+
+def pack_text(text):
+    data = text.encode("utf-8")
+    return LENGTH.pack(len(data)) + data
+
+def frame(payload):
+    if len(payload) < 0xFF:
+        return bytes((len(payload),)) + payload
+    return b"\xff" + LENGTH.pack(len(payload)) + payload
+
+#path -> [file, loggers using it]. every GameLogger on a path writes through the same buffer, so records from two
+#windows never interleave mid-record
+shared_files = dict()
+
+def open_shared(path):
+    entry = shared_files.get(path)
+    if entry is None:
+        entry = shared_files[path] = [open(path, "ab", buffering=65536), 0]
+    entry[1] += 1
+    return entry[0]
+
+def release_shared(path):
+    entry = shared_files[path]
+    entry[1] -= 1
+    if not entry[1]:
+        entry[0].close()
+        del shared_files[path]
+
+class GameLogger:
+    """
+    appends events to a log file. the file is opened on the first event.
+    """
+    def __init__(self, path=LOG_PATH):
+        self.path = os.path.abspath(path)
+        self.file = None
+        self.started = 0.0
+        self.session = random.getrandbits(32) or 1 #0 is what old logs read back as
+
+    def write(self, payload):
+        if self.file is None:
+            self.file = open_shared(self.path)
+        self.file.write(frame(payload))
+
+    def start(self, match):
+        """
+        - logs the settings and word of a hangman_engine.Match whose game has just been created
+        """
+        self.started = time.time()
+        self.write(GAME_HEADER.pack(GAME, self.session, self.started, match.guesses, int(match.phrase))
+                   + pack_text(match.word_picker or "") + pack_text(match.word_guesser or "") + pack_text(match.game.word)
+                   + pack_text(match.alphabet))
+
+    def guess(self, letter, result):
+        milliseconds = min(int((time.time() - self.started) * 1000), 0xFFFFFFFF)
+        self.write(GUESS_HEADER.pack(GUESS, self.session, result, milliseconds) + letter.encode("utf-8"))
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.write(END_RECORD.pack(END, self.session))
+            self.file.flush()
+            release_shared(self.path)
+            self.file = None
+
+class GameRecord:
+    """
+    one logged game: settings, word and (letter, result, milliseconds) guesses
+    """
+    __slots__ = ("started", "guesses", "phrase", "picker", "guesser", "word", "alphabet", "moves")
+
+    def __init__(self, started, guesses, phrase, picker, guesser, word, alphabet=hangman_alphabets.DEFAULT):
+        self.started = started
+        self.guesses = guesses
+        self.phrase = phrase
+        self.picker = picker
+        self.guesser = guesser
+        self.word = word
+        self.alphabet = alphabet
+        self.moves = []
+
+def unpack_text(payload, offset):
+    (length,) = LENGTH.unpack_from(payload, offset)
+    offset += LENGTH.size
+    return payload[offset:offset + length].decode("utf-8"), offset + length
+
+def read_events(path):
+    """
+    - yields each event as a tuple: (GAME, session, started, guesses, phrase, picker, guesser, word, alphabet),
+    (GUESS, session, result, milliseconds, letter) or (END, session). stops quietly at a truncated final record,
+    which is what a crash mid-write leaves behind.
+    """
+    with open(path, "rb", buffering=1 << 20) as f:
+        read = f.read
+        while True:
+            prefix = read(1)
+            if not prefix:
+                return
+            length = prefix[0]
+            if length == 0xFF:
+                data = read(LENGTH.size)
+                if len(data) < LENGTH.size:
+                    return
+                (length,) = LENGTH.unpack(data)
+            payload = read(length)
+            if len(payload) < length:
+                return
+
+            kind = payload[0]
+            if kind == GUESS:
+                kind, session, result, milliseconds = GUESS_HEADER.unpack_from(payload)
+                yield (GUESS, session, result, milliseconds, payload[GUESS_HEADER.size:].decode("utf-8"))
+            elif kind == GAME:
+                kind, session, started, guesses, phrase = GAME_HEADER.unpack_from(payload)
+                picker, offset = unpack_text(payload, GAME_HEADER.size)
+                guesser, offset = unpack_text(payload, offset)
+                word, offset = unpack_text(payload, offset)
+                alphabet = unpack_text(payload, offset)[0]
+                yield (GAME, session, started, guesses, bool(phrase), picker, guesser, word, alphabet)
+            elif kind == END:
+                yield END_RECORD.unpack_from(payload)
+
+def read_games(events):
+    """
+    - groups an event stream into GameRecords, matching guesses to their game by session. a record is yielded when
+    its session starts another game or ends, so only each open session's current game is held in memory. games of
+    sessions still open when the stream ends come last, in the order they started.
+    """
+    playing = dict() #session -> GameRecord
+    for event in events:
+        kind, session = event[0], event[1]
+        if kind == GUESS:
+            record = playing.get(session)
+            if record is not None:
+                kind, session, result, milliseconds, letter = event
+                record.moves.append((letter, result, milliseconds))
+        else:
+            record = playing.pop(session, None)
+            if record is not None:
+                yield record
+            if kind == GAME:
+                playing[session] = GameRecord(*event[2:])
+    yield from playing.values()
+
+def replay(records):
+    """
+    - plays each record through hangman_engine at full speed. yields (record, GameState, matched), where matched
+    is False if the engine disagreed with a logged result (a log written under different rules).
+    """
+    for record in records:
+        state = hangman_engine.GameState(record.word, record.guesses, hangman_alphabets.get(record.alphabet).bits)
+        matched = True
+        for letter, result, milliseconds in record.moves:
+            if hangman_engine.guess(state, letter) != result:
+                matched = False
+        yield record, state, matched
+
+def summarize(path):
+    games = wins = misses = mismatches = 0
+    for record, state, matched in replay(read_games(read_events(path))):
+        games += 1
+        wins += state.won
+        misses += state.misses
+        mismatches += not matched
+    return games, wins, misses, mismatches
+
+def drive_ui(root, records, speed=1.0, pause_ms=1500):
+    """
+    - re-drives a hangman_game_ui.WindowMain through the logged games: settings, word, then each guess, spaced
+    by the logged timings divided by speed. scheduled with root.after, one step at a time, so mainloop stays live.
+    """
+    import hangman_game_ui as ui
+
+    root.recording = False #a replay shouldn't log itself or count towards stats
+    records = iter(records)
+
+    def next_game():
+        record = next(records, None)
+        if record is None:
+            root.next_page(ui.StartPage)
+            return
+        root.next_page(ui.SettingsPage) #fresh match, like pressing Play
+        match = root.match
+        match.player_one, match.player_two = record.picker, record.guesser
+        match.word_picker, match.word_guesser = record.picker, record.guesser
+        match.guesses, match.phrase, match.alphabet = record.guesses, record.phrase, record.alphabet
+        root.next_page(ui.WordPage)
+        word_page = root.frames[ui.WordPage]
+        word_page.game_word.set(record.word)
+        word_page.WordPage_func()
+        next_guess(record, 0, 0)
+
+    def next_guess(record, index, previous_ms):
+        if index == len(record.moves):
+            root.after(int(pause_ms / speed), next_game)
+            return
+        letter, result, milliseconds = record.moves[index]
+
+        def play():
+            game_page = root.frames[ui.GamePage]
+            game_page.player_guess.set(letter)
+            game_page.GamePage_func()
+            next_guess(record, index + 1, milliseconds)
+
+        root.after(max(0, int((milliseconds - previous_ms) / speed)), play)
+
+    next_game()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="summarize or replay a hangman game log")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser("summary", help="replay every game headless at full speed")
+    summary.add_argument("log", nargs="?", default=LOG_PATH)
+    ui_replay = commands.add_parser("replay", help="replay the games through the Tk window")
+    ui_replay.add_argument("log", nargs="?", default=LOG_PATH)
+    ui_replay.add_argument("--speed", type=float, default=1.0, help="multiplier on the logged timings")
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        start = time.perf_counter()
+        games, wins, misses, mismatches = summarize(args.log)
+        seconds = time.perf_counter() - start
+        print("games:        %d" % games)
+        if games:
+            print("guesser wins: %.3f" % (wins / games))
+            print("mean misses:  %.3f" % (misses / games))
+        print("mismatches:   %d" % mismatches)
+        print("games/sec:    %.0f" % (games / seconds if seconds else 0))
+    else:
+        import hangman_game_ui
+        root = hangman_game_ui.WindowMain()
+        drive_ui(root, read_games(read_events(args.log)), args.speed)
+        root.mainloop()
+
+if __name__ == "__main__":
+    main()
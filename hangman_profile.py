@@ -0,0 +1,166 @@
+"""
+opt-in latency instrumentation for the Tk window.
+
+set HANGMAN_PROFILE before starting the game to turn it on (HANGMAN_PROFILE=1, or a path to export to):
+- every <Return>/button handler and every next_page() is timed, plus the time from next_page() until Tk next goes idle (the repaint)
+- an after()-based heartbeat measures how late the event loop runs its timers (event-loop lag)
+- samples go into fixed-size ring-buffer histograms. F12 toggles a debug overlay and the export is written when the window closes
+
+when HANGMAN_PROFILE isn't set, install() is never called and nothing is wrapped, so there's no overhead at all.
+"""
+import json
+import os
+import time
+import tkinter as tk
+from array import array
+
+DEFAULT_EXPORT = "hangman_profile.json"
+
+#handlers timed on each page, by page class name. dictionary_checked and show_hint are the UI-thread halves of background
+#work, and network_result the half of a network guess that runs once the server has played it
+HANDLERS = {
+    "SettingsPage": ("update_Word_Picker",),
+    "WordPage": ("WordPage_func", "dictionary_checked"),
+    "GamePage": ("GamePage_func", "give_hint", "show_hint", "network_result"),
+}
+
+def enabled():
+    return bool(os.environ.get("HANGMAN_PROFILE"))
+
+def export_path():
+    value = os.environ.get("HANGMAN_PROFILE", "")
+    return DEFAULT_EXPORT if value in ("", "1") else value
+
+class RingHistogram:
+    """
+    the last size samples in a preallocated ring (for percentiles), plus lifetime counts in log2-microsecond buckets.
+    add() is an array store and a few integer ops; nothing is allocated per sample.
+    """
+    __slots__ = ("samples", "size", "index", "count", "total", "buckets")
+
+    def __init__(self, size=2048):
+        self.samples = array("d", bytes(8 * size))
+        self.size = size
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * 32 #bucket i holds samples under 2**i microseconds
+
+    def add(self, seconds):
+        self.samples[self.index] = seconds
+        self.index = (self.index + 1) % self.size
+        self.count += 1
+        self.total += seconds
+        self.buckets[min(31, int(seconds * 1e6).bit_length())] += 1
+
+    def recent(self):
+        return sorted(self.samples[:min(self.count, self.size)])
+
+    def summary(self):
+        recent = self.recent()
+        if not recent:
+            return {"count": 0}
+        def at(fraction):
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))] * 1000
+        return {"count": self.count, "mean_ms": self.total / self.count * 1000, "p50_ms": at(0.50),
+                "p90_ms": at(0.90), "p99_ms": at(0.99), "max_ms": recent[-1] * 1000,
+                "counts_under_us": {str(1 << i): n for i, n in enumerate(self.buckets) if n}}
+
+class Profiler:
+    def __init__(self, heartbeat_ms=50):
+        self.histograms = dict()
+        self.heartbeat_ms = heartbeat_ms
+        self.overlay = None
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RingHistogram()
+        return histogram
+
+    def timed(self, name, func):
+        """
+        - wraps func so each call is added to the name histogram
+        """
+        add = self.histogram(name).add
+        clock = time.perf_counter
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add(clock() - start)
+        return wrapper
+
+    def heartbeat(self, root):
+        """
+        - schedules itself every heartbeat_ms and records how late each tick fires
+        """
+        add = self.histogram("event_loop_lag").add
+        interval = self.heartbeat_ms / 1000
+        clock = time.perf_counter
+        def tick(expected):
+            now = clock()
+            add(max(0.0, now - expected))
+            root.after(self.heartbeat_ms, tick, now + interval)
+        root.after(self.heartbeat_ms, tick, clock() + interval)
+
+    def summary(self):
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def overlay_text(self):
+        lines = ["%-28s %6s %8s %8s" % ("", "count", "p50 ms", "p99 ms")]
+        for name, summary in self.summary().items():
+            if summary["count"]:
+                lines.append("%-28s %6d %8.2f %8.2f" % (name, summary["count"], summary["p50_ms"], summary["p99_ms"]))
+        return "\n".join(lines)
+
+    def toggle_overlay(self, root):
+        if self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+            return
+        self.overlay = tk.Toplevel(root)
+        self.overlay.title("Latency")
+        label = tk.Label(self.overlay, font="TkFixedFont", justify="left") #the named font; in a (family, size) tuple it would fall back to a proportional font
+        label.pack(padx=6, pady=6)
+        overlay = self.overlay
+        def refresh():
+            if self.overlay is overlay:
+                label.configure(text=self.overlay_text())
+                overlay.after(500, refresh)
+        refresh()
+
+def install(root):
+    """
+    - instruments a hangman_game_ui.WindowMain. call before the first next_page().
+    shadows root.next_page and root.build_page with timed versions, and times each page's handlers as it's built.
+    """
+    profiler = Profiler()
+    root.profiler = profiler
+
+    next_page, build_page = root.next_page, root.build_page
+    clock = time.perf_counter
+
+    def timed_next_page(page, *args):
+        start = clock()
+        next_page(page, *args)
+        profiler.histogram("next_page:" + page.__name__).add(clock() - start)
+        repaint = profiler.histogram("until_idle:" + page.__name__).add
+        root.after_idle(lambda: repaint(clock() - start)) #next_page() plus everything Tk does before going idle
+
+    def timed_build_page(page):
+        frame = profiler.timed("build_page:" + page.__name__, build_page)(page)
+        for name in HANDLERS.get(page.__name__, ()):
+            setattr(frame, name, profiler.timed(page.__name__ + "." + name, getattr(frame, name)))
+        return frame
+
+    root.next_page = timed_next_page
+    root.build_page = timed_build_page
+    root.bind("<F12>", lambda event: profiler.toggle_overlay(root))
+    profiler.heartbeat(root)
+    return profiler
@@ -0,0 +1,215 @@
+"""
+asyncio server that hosts many independent network games at once.
+
+each session follows the same flow as the Tk pages:
+- settings: the picker sends "new" (name, guesses, phrase mode) and gets a session id. the guesser sends "join" with that id
+- word: the picker sends "word", which is checked with the same rules as WordPage_func()
+- game: the guesser sends "guess" until hangman_engine says the round is over
+
+messages are JSON objects, one per line, e.g. {"op": "guess", "letter": "E"}. every state change is sent to both
+players. bad requests only get {"op": "error", "message": ...} sent back to the sender.
+
+    python hangman_server.py --host 127.0.0.1 --port 8765
+"""
+import argparse
+import asyncio
+import itertools
+import json
+
+import hangman_engine
+
+RESULT_NAMES = {
+    hangman_engine.INVALID: "invalid",
+    hangman_engine.REPEATED: "repeated",
+    hangman_engine.WRONG: "wrong",
+    hangman_engine.CORRECT: "correct",
+}
+
+#session stages, same order as the pages
+JOINING, PICKING, GUESSING, OVER = range(4)
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+class Player:
+    __slots__ = ("name", "writer", "session")
+
+    def __init__(self, name, writer):
+        self.name = name
+        self.writer = writer
+        self.session = None
+
+    def send(self, message):
+        self.writer.write(encode(message))
+
+class Session:
+    """
+    one hosted game: two players, the settings, and the hangman_engine.GameState once the word is in
+    """
+    __slots__ = ("id", "picker", "guesser", "guesses", "phrase", "stage", "game")
+
+    def __init__(self, session_id, picker, guesses, phrase):
+        self.id = session_id
+        self.picker = picker
+        self.guesser = None
+        self.guesses = guesses
+        self.phrase = phrase
+        self.stage = JOINING
+        self.game = None
+
+    def broadcast(self, message):
+        data = encode(message)
+        for player in (self.picker, self.guesser):
+            if player is not None:
+                player.writer.write(data)
+
+class Error(Exception):
+    """
+    a request that can't be applied. the message goes back to the sender and the connection stays open.
+    """
+
+async def skip_line(reader):
+    """
+    - discards the rest of a line longer than the reader's limit. readuntil() leaves it in the buffer, so the next read starts clean.
+    """
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as error:
+            await reader.readexactly(error.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+class HangmanServer:
+    def __init__(self):
+        self.sessions = dict()
+        self.ids = itertools.count(1)
+
+    async def handle_connection(self, reader, writer):
+        player = Player("", writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial #the last line, with no newline before EOF
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError:
+                    await skip_line(reader)
+                    player.send({"op": "error", "message": "message too long"})
+                    continue
+                try:
+                    self.dispatch(player, json.loads(line))
+                except (Error, ValueError, KeyError, TypeError, RecursionError) as error:
+                    player.send({"op": "error", "message": str(error)})
+                if writer.transport.get_write_buffer_size() > 65536: #only wait on slow readers
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.leave(player)
+            writer.close()
+
+    def dispatch(self, player, message):
+        handler = getattr(self, "op_" + str(message["op"]), None)
+        if handler is None:
+            raise Error("unknown op %r" % message["op"])
+        handler(player, message)
+
+    def op_new(self, player, message):
+        if player.session is not None:
+            raise Error("already in a session")
+        guesses = message.get("guesses", hangman_engine.MIN_GUESSES)
+        if type(guesses) is not int or not hangman_engine.MIN_GUESSES <= guesses <= hangman_engine.MAX_GUESSES:
+            raise Error("guesses must be between %d and %d" % (hangman_engine.MIN_GUESSES, hangman_engine.MAX_GUESSES))
+        player.name = str(message.get("name", "Player 1"))
+        session = Session(next(self.ids), player, guesses, bool(message.get("phrase", False)))
+        player.session = session
+        self.sessions[session.id] = session
+        player.send({"op": "session", "id": session.id, "role": "picker"})
+
+    def op_join(self, player, message):
+        if player.session is not None:
+            raise Error("already in a session")
+        session = self.sessions.get(message["id"])
+        if session is None or session.stage != JOINING:
+            raise Error("no open session %r" % message["id"])
+        player.name = str(message.get("name", "Player 2"))
+        player.session = session
+        session.guesser = player
+        session.stage = PICKING
+        session.broadcast({"op": "joined", "id": session.id, "picker": session.picker.name, "guesser": player.name,
+                           "guesses": session.guesses, "phrase": session.phrase})
+
+    def op_word(self, player, message):
+        session = self.session_for(player, "picker", PICKING)
+        if session.phrase:
+            word = hangman_engine.normalize_phrase(str(message["word"]))
+            error = hangman_engine.validate_phrase(word)
+        else:
+            word = str(message["word"]).upper()
+            error = hangman_engine.validate_word(word)
+        if error is not None:
+            raise Error(error)
+        session.game = hangman_engine.GameState(word, session.guesses)
+        session.stage = GUESSING
+        session.broadcast({"op": "start", "blank": "".join(session.game.blank), "guesses_left": session.guesses})
+
+    def op_guess(self, player, message):
+        session = self.session_for(player, "guesser", GUESSING)
+        letter = str(message["letter"]).upper()
+        game = session.game
+        result = hangman_engine.guess(game, letter)
+        if result == hangman_engine.INVALID or result == hangman_engine.REPEATED:
+            raise Error("Guess failed. Must be a single letter you've yet to guess.")
+        session.broadcast({"op": "result", "letter": letter, "result": RESULT_NAMES[result],
+                           "blank": "".join(game.blank), "guesses_left": game.guesses_left})
+        if game.over:
+            session.stage = OVER
+            winner = session.guesser if game.won else session.picker
+            session.broadcast({"op": "over", "winner": winner.name, "word": game.word})
+            self.sessions.pop(session.id, None)
+            session.picker.session = session.guesser.session = None
+
+    def session_for(self, player, role, stage):
+        session = player.session
+        if session is None or getattr(session, role) is not player:
+            raise Error("only the %s can do that" % role)
+        if session.stage != stage:
+            raise Error("not now")
+        return session
+
+    def leave(self, player):
+        """
+        - drops the player's session when they disconnect and tells the other player
+        """
+        session = player.session
+        if session is None:
+            return
+        self.sessions.pop(session.id, None)
+        for other in (session.picker, session.guesser):
+            if other is not None and other is not player:
+                other.session = None
+                other.send({"op": "left", "name": player.name})
+        player.session = None
+
+async def serve(host, port):
+    server = HangmanServer()
+    listener = await asyncio.start_server(server.handle_connection, host, port, backlog=4096)
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="host network hangman sessions")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+hint engine: suggests the next letter from the dictionary words that still fit the word blank. also home to the
+Adversary, the computer word picker that never commits to a word.
+
+needs NumPy. each word length gets one character matrix (one row per word, one column per letter). for plain ASCII
+buckets the matrix is a zero-copy view of the memory-mapped hangman_dictionary file. a CandidateSet keeps the row
+numbers still in play, and each guess only narrows those rows. it never refilters the whole dictionary.
+"""
+import random
+
+import numpy as np
+
+import hangman_dictionary
+
+class Solver:
+    """
+    per-dictionary cache of character matrices and first-hint letter counts, both keyed by word length
+    """
+    def __init__(self, dictionary=None):
+        self.dictionary = dictionary if dictionary is not None else hangman_dictionary.Dictionary()
+        self._matrices = dict()
+        self._base_counts = dict()
+
+    def matrix(self, length):
+        """
+        - (words, length) matrix of code points for every dictionary word of that length
+        """
+        matrix = self._matrices.get(length)
+        if matrix is None:
+            bucket = self.dictionary.buckets.get(length)
+            if bucket is None:
+                matrix = np.zeros((0, length), dtype=np.uint8)
+            elif bucket.width == length: #one byte per letter: view the mapped records directly
+                matrix = np.frombuffer(self.dictionary.data, dtype=np.uint8, count=bucket.count * length,
+                                       offset=bucket.words_offset).reshape(bucket.count, length)
+            else:
+                codes = [[ord(letter) for letter in word] for word in self.dictionary.words(length)]
+                matrix = np.array(codes, dtype=np.uint32).reshape(-1, length)
+            self._matrices[length] = matrix
+        return matrix
+
+    def candidates(self, length):
+        return CandidateSet(self, length)
+
+    def base_counts(self, length):
+        """
+        - letter -> number of words containing it, over the whole bucket. every game of this length starts from these.
+        """
+        counts = self._base_counts.get(length)
+        if counts is None:
+            counts = letter_counts(self.matrix(length))
+            self._base_counts[length] = counts
+        return counts
+
+def letter_counts(rows):
+    """
+    - {letter: number of rows containing it}. one vectorized pass per distinct code point.
+    """
+    if rows.shape[0] == 0:
+        return dict()
+    return {chr(code): int((rows == code).any(axis=1).sum()) for code in np.unique(rows).tolist()}
+
+class CandidateSet:
+    """
+    the dictionary words of one length still consistent with every guess applied so far
+    """
+    def __init__(self, solver, length):
+        self.solver = solver
+        self.length = length
+        self.matrix = solver.matrix(length)
+        self.rows = None #None means every row; avoids materializing the full index before the first guess
+
+    def __len__(self):
+        return self.matrix.shape[0] if self.rows is None else len(self.rows)
+
+    def current(self):
+        return self.matrix if self.rows is None else self.matrix[self.rows]
+
+    def apply(self, letter, positions):
+        """
+        - narrows the set by one guess. positions are where the blank now shows letter; empty for a miss.
+        """
+        hits = self.current() == ord(letter)
+        if positions:
+            expected = np.zeros(self.length, dtype=bool)
+            expected[list(positions)] = True
+            keep = (hits == expected).all(axis=1)
+        else:
+            keep = ~hits.any(axis=1)
+        kept = np.flatnonzero(keep)
+        self.rows = kept if self.rows is None else self.rows[kept]
+
+    def best_letter(self, guessed):
+        """
+        - the unguessed letter contained in the most remaining candidates, or None if no candidates are left
+        """
+        counts = self.solver.base_counts(self.length) if self.rows is None else letter_counts(self.current())
+        options = [(-count, letter) for letter, count in counts.items() if letter not in guessed]
+        return min(options)[1] if options else None
+
+class Hinter:
+    """
+    follows one round. update() applies only the guesses made since the last call, then hint() reads the best letter.
+    """
+    def __init__(self, solver, length):
+        self.candidates = solver.candidates(length)
+        self.applied = 0
+
+    def update(self, blank, letters_guessed):
+        for letter in letters_guessed[self.applied:]:
+            self.candidates.apply(letter, [i for i, shown in enumerate(blank) if shown == letter])
+        self.applied = len(letters_guessed)
+
+    def hint(self, blank, letters_guessed):
+        self.update(blank, letters_guessed)
+        return self.candidates.best_letter(set(letters_guessed))
+
+#signatures are int64 position bitmasks, so the adversary handles words up to this long
+MAX_SIGNATURE_LENGTH = 62
+
+def pattern_signatures(rows, code):
+    """
+    - one int64 per row: bit i is set where the row has code at position i. rows sharing a signature are the
+    family a guess of code can't tell apart. one vectorized compare and one matrix-vector product.
+    """
+    weights = np.left_shift(np.int64(1), np.arange(rows.shape[1], dtype=np.int64))
+    return (rows == code).astype(np.int64) @ weights
+
+class Adversary:
+    """
+    "evil" word picker. holds every dictionary word of one length and commits to none of them. each guess splits the
+    candidates into families by where the letter would appear, and the biggest family survives (on a tie, the one
+    revealing fewest letters, so a miss wins). respond() returns where the guess landed for hangman_engine.commit().
+    """
+    def __init__(self, solver, length):
+        if length > MAX_SIGNATURE_LENGTH:
+            raise ValueError("the adversary handles words up to %d letters" % MAX_SIGNATURE_LENGTH)
+        self.length = length
+        self.candidates = solver.candidates(length)
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def respond(self, letter):
+        """
+        - narrows the candidates to the largest family for letter and returns that family's positions (empty for a miss)
+        """
+        candidates = self.candidates
+        signatures = pattern_signatures(candidates.current(), ord(letter))
+        families, counts = np.unique(signatures, return_counts=True)
+        reveals = [bin(family).count("1") for family in families.tolist()]
+        best = min(range(len(families)), key=lambda i: (-counts[i], reveals[i]))
+        family = int(families[best])
+        kept = np.flatnonzero(signatures == family)
+        candidates.rows = kept if candidates.rows is None else candidates.rows[kept]
+        return tuple(i for i in range(self.length) if family >> i & 1)
+
+    def word(self, rng=random):
+        """
+        - a word still consistent with every answer given, for the gameover message. once the blank is full there's only one.
+        """
+        rows = self.candidates.current()
+        if rows.shape[0] == 0:
+            return None
+        return "".join(map(chr, rows[rng.randrange(rows.shape[0])].tolist()))
@@ -0,0 +1,198 @@
+"""
+persistent per-player statistics and leaderboard, stored in SQLite (WAL mode).
+
+finished games are recorded with Stats.record(), which only puts a row on a queue. a background writer thread
+gathers whatever has queued up and writes it in one transaction, so the Tk thread never waits on the disk.
+every game is also folded into the players table as it's written, so the leaderboard reads one indexed table.
+it never scans the games.
+
+a batch that fails to write (the database locked past its timeout, a full disk, an unwritable path) is retried on a
+fresh connection, then dropped and logged, so the writer thread keeps going for the games after it.
+"""
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+STATS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hangman_stats.db")
+COMPUTER = "Computer" #picker of single-player games. its games are kept, but it isn't a player on the leaderboard
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    picker TEXT NOT NULL,
+    guesser TEXT NOT NULL,
+    guesser_won INTEGER NOT NULL,
+    misses INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    phrase INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_picker ON games (picker, played_at);
+CREATE INDEX IF NOT EXISTS games_guesser ON games (guesser, played_at);
+
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    picker_wins INTEGER NOT NULL DEFAULT 0,
+    picker_losses INTEGER NOT NULL DEFAULT 0,
+    guesser_wins INTEGER NOT NULL DEFAULT 0,
+    guesser_losses INTEGER NOT NULL DEFAULT 0,
+    guesser_misses INTEGER NOT NULL DEFAULT 0,
+    streak INTEGER NOT NULL DEFAULT 0,
+    best_streak INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_wins ON players (wins DESC, losses);
+"""
+
+INSERT_GAME = """
+INSERT INTO games (played_at, picker, guesser, guesser_won, misses, guesses, length, phrase)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_PLAYER = "INSERT OR IGNORE INTO players (name) VALUES (?)"
+
+#one statement for both roles so a batch can be applied strictly in game order (streaks depend on it).
+#SQLite evaluates every SET expression against the old row, so best_streak sees the pre-update streak
+UPDATE_PLAYER = """
+UPDATE players SET
+    wins = wins + :won,
+    losses = losses + 1 - :won,
+    picker_wins = picker_wins + :picker * :won,
+    picker_losses = picker_losses + :picker * (1 - :won),
+    guesser_wins = guesser_wins + (1 - :picker) * :won,
+    guesser_losses = guesser_losses + (1 - :picker) * (1 - :won),
+    guesser_misses = guesser_misses + (1 - :picker) * :misses,
+    streak = CASE WHEN :won THEN streak + 1 ELSE 0 END,
+    best_streak = MAX(best_streak, CASE WHEN :won THEN streak + 1 ELSE 0 END)
+WHERE name = :name
+"""
+
+LEADERBOARD = """
+SELECT name, wins, losses, picker_wins, picker_losses, guesser_wins, guesser_losses,
+       CASE WHEN guesser_wins + guesser_losses > 0 THEN 1.0 * guesser_misses / (guesser_wins + guesser_losses) END,
+       streak, best_streak
+FROM players WHERE name != ? ORDER BY wins DESC, losses LIMIT ?
+"""
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL") #WAL keeps this crash-safe; only the last commits can be lost on power failure
+    connection.executescript(SCHEMA)
+    return connection
+
+class Stats:
+    """
+    record() from the Tk thread, leaderboard() to read. the writer thread starts on the first record().
+    """
+    def __init__(self, path=STATS_PATH, batch_size=512, flush_interval=0.2, attempts=3):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.attempts = attempts #tries per batch before it's dropped
+        self.pending = queue.Queue()
+        self.writer = None
+        self.reader = None
+        self.dropped = 0 #games given up on after every attempt failed
+
+    def record(self, picker, guesser, guesser_won, misses, guesses, length, phrase=False):
+        """
+        - queues one finished game. returns immediately.
+        """
+        self.pending.put((time.time(), picker, guesser, int(guesser_won), misses, guesses, length, int(phrase)))
+        if self.writer is None or not self.writer.is_alive(): #the first game, or the last writer died
+            self.writer = threading.Thread(target=self.write_loop, name="hangman-stats-writer", daemon=True)
+            self.writer.start()
+
+    def record_match(self, match):
+        """
+        - records a finished hangman_engine.Match
+        """
+        game = match.game
+        self.record(match.word_picker, match.word_guesser, game.won, game.misses, match.guesses, len(game.word), match.phrase)
+
+    def write_loop(self):
+        connection = None #opened by the first write
+        try:
+            while True:
+                batch = [self.pending.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size and batch[-1] is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self.pending.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                done = batch[-1] is None
+                if done:
+                    batch.pop()
+                if batch:
+                    connection = self.write_with_retries(connection, batch)
+                if done:
+                    return
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def write_with_retries(self, connection, batch):
+        """
+        - writes batch, reconnecting and trying again after an sqlite3.Error, with a growing pause in between. once
+        every attempt has failed the batch is dropped and logged. returns the connection for the next batch (None to reconnect).
+        """
+        for attempt in range(1, self.attempts + 1):
+            try:
+                if connection is None:
+                    connection = connect(self.path)
+                self.write_batch(connection, batch)
+                return connection
+            except sqlite3.Error:
+                logger.exception("writing %d games to %s failed (attempt %d of %d)", len(batch), self.path, attempt, self.attempts)
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                if attempt < self.attempts:
+                    time.sleep(self.flush_interval * attempt)
+        self.dropped += len(batch)
+        logger.error("dropped %d games that could not be written to %s", len(batch), self.path)
+        return None
+
+    def write_batch(self, connection, batch):
+        updates = []
+        for played_at, picker, guesser, guesser_won, misses, guesses, length, phrase in batch:
+            if picker != COMPUTER:
+                updates.append({"name": picker, "picker": 1, "won": 1 - guesser_won, "misses": 0})
+            updates.append({"name": guesser, "picker": 0, "won": guesser_won, "misses": misses})
+        with connection: #one transaction per batch
+            connection.executemany(INSERT_GAME, batch)
+            connection.executemany(INSERT_PLAYER, [(update["name"],) for update in updates])
+            connection.executemany(UPDATE_PLAYER, updates)
+
+    def close(self):
+        """
+        - writes everything still queued, then stops the writer thread
+        """
+        if self.writer is not None:
+            if self.writer.is_alive(): #a dead writer would leave the None queued for the next one
+                self.pending.put(None)
+                self.writer.join()
+            self.writer = None
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def leaderboard(self, limit=10):
+        """
+        - top players by wins, as tuples: (name, wins, losses, picker_wins, picker_losses, guesser_wins, guesser_losses, average misses or None, streak, best_streak)
+        """
+        if self.reader is None:
+            self.reader = connect(self.path)
+        return self.reader.execute(LEADERBOARD, (COMPUTER, limit)).fetchall()
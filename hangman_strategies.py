@@ -0,0 +1,157 @@
+"""
+automated guesser strategies for hangman_engine.
+
+a strategy is a class built once per process with the full word list. for each round, guesser(length) returns
+a callable that takes the hangman_engine.GameState and returns the next letter. guessers only look at what a player
+could see (state.blank and the letters guessed so far), never at state.word.
+
+plugins outside this module are named "package.module:ClassName" and are loaded with load_strategy().
+"""
+import importlib
+import math
+from collections import Counter
+
+import hangman_engine
+
+def group_by_length(words):
+    """
+    - returns {length: [words]} for every length in words
+    """
+    groups = dict()
+    for word in words:
+        groups.setdefault(len(word), []).append(word)
+    return groups
+
+def narrow(candidates, letter, blank):
+    """
+    - keeps the candidates still consistent with the last guess. a hit must sit at exactly the positions
+    the blank shows for that letter, a miss must not appear at all.
+    """
+    hits = [i for i, shown in enumerate(blank) if shown == letter]
+    if not hits:
+        return [word for word in candidates if letter not in word]
+    count = len(hits)
+    return [word for word in candidates if word.count(letter) == count and all(word[i] == letter for i in hits)]
+
+class Strategy:
+    """
+    base class for strategies that keep a shrinking candidate list for each round.
+    subclasses implement pick(candidates, state) and return an unguessed letter.
+
+    the candidates, and so the pick, only depend on the blank and the set of letters guessed. every game of a length
+    starts from the same full bucket and passes through the same few big states early on, so any state with at least
+    cache_min candidates keeps its (candidates, pick) in self.cache. those are the picks that cost time in proportion
+    to the list; after the first game of a length, a game only pays for the small states it reaches itself.
+    a subclass whose pick() looks at anything else (randomness, timing) should set cache_min = None.
+    """
+    name = None
+    cache_min = 64
+
+    def __init__(self, words):
+        self.by_length = group_by_length(words)
+        self.cache = dict() #(blank, guessed bitmask) -> (candidates, pick)
+        totals = Counter()
+        for word in words:
+            totals.update(set(word))
+        #letters by how many words contain them, then the rest of the alphabet. used when candidates run out
+        self.fallback = [letter for letter, count in totals.most_common()]
+        self.fallback += [letter for letter in hangman_engine.ALPHABET if letter not in totals]
+
+    def guesser(self, length):
+        candidates = self.by_length.get(length, [])
+        seen = 0
+
+        def guess(state):
+            nonlocal candidates, seen
+            order = state.guessed_order
+            key = (tuple(state.blank), state.guessed) #the blank's length stands in for the bucket
+            cached = self.cache.get(key)
+            if cached is not None:
+                candidates, letter = cached
+                seen = len(order)
+            else:
+                while seen < len(order): #narrow by every guess made since the last call
+                    candidates = narrow(candidates, order[seen], state.blank)
+                    seen += 1
+                letter = self.pick(candidates, state) if candidates else None
+                if self.cache_min is not None and len(candidates) >= self.cache_min:
+                    self.cache[key] = (candidates, letter)
+            return letter if letter is not None else self.first_unguessed(self.fallback, state)
+
+        return guess
+
+    def first_unguessed(self, letters, state):
+        for letter in letters:
+            if not state.is_guessed(letter):
+                return letter
+
+    def pick(self, candidates, state):
+        raise NotImplementedError
+
+class FrequencyStrategy(Strategy):
+    """
+    fixed order: letters by how many words in the whole list contain them. ignores the candidates.
+    """
+    name = "frequency"
+
+    def guesser(self, length):
+        return lambda state: self.first_unguessed(self.fallback, state)
+
+class CandidateFrequencyStrategy(Strategy):
+    """
+    letter contained in the most remaining candidates.
+    """
+    name = "candidates"
+
+    def pick(self, candidates, state):
+        counts = Counter()
+        for word in candidates:
+            counts.update(set(word))
+        return self.first_unguessed([letter for letter, count in counts.most_common()], state)
+
+class PositionalStrategy(Strategy):
+    """
+    letter that fills the most hidden positions across the remaining candidates.
+    """
+    name = "positional"
+
+    def pick(self, candidates, state):
+        hidden = [i for i, shown in enumerate(state.blank) if shown == "_"]
+        counts = Counter()
+        for word in candidates:
+            counts.update(word[i] for i in hidden)
+        return self.first_unguessed([letter for letter, count in counts.most_common()], state)
+
+class EntropyStrategy(Strategy):
+    """
+    letter whose reveal pattern splits the remaining candidates the most evenly (highest Shannon entropy).
+    """
+    name = "entropy"
+
+    def pick(self, candidates, state):
+        total = len(candidates)
+        letters = set()
+        for word in candidates:
+            letters.update(word)
+        best, best_score = None, -1.0
+        for letter in sorted(letters):
+            if state.is_guessed(letter):
+                continue
+            families = Counter(tuple(i for i, c in enumerate(word) if c == letter) for word in candidates)
+            score = -sum(n / total * math.log2(n / total) for n in families.values())
+            if score > best_score:
+                best, best_score = letter, score
+        return best
+
+STRATEGIES = {strategy.name: strategy for strategy in (FrequencyStrategy, CandidateFrequencyStrategy, PositionalStrategy, EntropyStrategy)}
+
+def load_strategy(spec):
+    """
+    - resolves a built-in strategy name or a "package.module:ClassName" plugin to its class
+    """
+    if spec in STRATEGIES:
+        return STRATEGIES[spec]
+    module_name, sep, attr = spec.partition(":")
+    if not sep:
+        raise ValueError("unknown strategy %r, expected one of %s or module:Class" % (spec, ", ".join(STRATEGIES)))
+    return getattr(importlib.import_module(module_name), attr)
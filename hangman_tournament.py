@@ -0,0 +1,144 @@
+"""
+command-line tournament: plays guesser strategies from hangman_strategies against every word in a word list.
+
+games are split into chunks and spread over a process pool. each worker builds its strategies once, plays its chunks
+and sends back small tallies, so results stream in while the tournament runs.
+
+    python hangman_tournament.py words.txt --strategy frequency --strategy entropy --guesses 8
+    python hangman_tournament.py words.txt --strategy mypackage.guessers:MyStrategy --workers 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import hangman_engine
+import hangman_strategies
+
+#filled in once per worker process by init_worker()
+worker_strategies = None
+worker_guesses = None
+
+class Tally:
+    """
+    running results for one strategy: totals plus a {length: [games, wins, misses]} breakdown
+    """
+    __slots__ = ("games", "wins", "misses", "by_length")
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.misses = 0
+        self.by_length = dict()
+
+    def add(self, length, won, misses):
+        self.games += 1
+        self.wins += won
+        self.misses += misses
+        row = self.by_length.setdefault(length, [0, 0, 0])
+        row[0] += 1
+        row[1] += won
+        row[2] += misses
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.misses += other.misses
+        for length, (games, wins, misses) in other.by_length.items():
+            row = self.by_length.setdefault(length, [0, 0, 0])
+            row[0] += games
+            row[1] += wins
+            row[2] += misses
+
+    #Tally crosses the process boundary, and __slots__ classes need these to pickle compactly
+    def __getstate__(self):
+        return (self.games, self.wins, self.misses, self.by_length)
+
+    def __setstate__(self, state):
+        self.games, self.wins, self.misses, self.by_length = state
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_misses(self):
+        return self.misses / self.games if self.games else 0.0
+
+def init_worker(words, specs, guesses):
+    """
+    - pool initializer. builds every strategy once per process instead of once per chunk.
+    """
+    global worker_strategies, worker_guesses
+    worker_strategies = [hangman_strategies.load_strategy(spec)(words) for spec in specs]
+    worker_guesses = guesses
+
+def play_chunk(chunk):
+    """
+    - plays every word in chunk with every strategy. returns one Tally per strategy.
+    """
+    tallies = [Tally() for strategy in worker_strategies]
+    for word in chunk:
+        for strategy, tally in zip(worker_strategies, tallies):
+            state = hangman_engine.play(word, worker_guesses, strategy.guesser(len(word)))
+            tally.add(len(word), state.won, state.misses)
+    return tallies
+
+def chunked(words, size):
+    for start in range(0, len(words), size):
+        yield words[start:start + size]
+
+def run(words, specs, guesses, workers=None, chunk_size=500, progress=None):
+    """
+    - plays the tournament and returns {spec: Tally}.
+    - progress(done, totals) is called after every finished chunk with the running totals.
+    """
+    totals = {spec: Tally() for spec in specs}
+    done = 0
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(words, specs, guesses)) as pool:
+        for tallies in pool.imap_unordered(play_chunk, chunked(words, chunk_size)):
+            for spec, tally in zip(specs, tallies):
+                totals[spec].merge(tally)
+            done += tallies[0].games
+            if progress is not None:
+                progress(done, totals)
+    return totals
+
+def print_progress(total_words, start):
+    def progress(done, totals):
+        rates = "  ".join("%s %.3f" % (spec, tally.win_rate) for spec, tally in totals.items())
+        print("[%d/%d %.1fs] win rate: %s" % (done, total_words, time.perf_counter() - start, rates), flush=True)
+    return progress
+
+def print_report(totals, out=sys.stdout):
+    for spec, tally in totals.items():
+        print("\n%s: %d games, win rate %.4f, mean misses %.3f" % (spec, tally.games, tally.win_rate, tally.mean_misses), file=out)
+        print("  length  games    win rate  mean misses", file=out)
+        for length in sorted(tally.by_length):
+            games, wins, misses = tally.by_length[length]
+            print("  %6d  %7d  %8.4f  %11.3f" % (length, games, wins / games, misses / games), file=out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="play guesser strategies against a word list")
+    parser.add_argument("words", help="word list, one word per line")
+    parser.add_argument("--strategy", action="append", dest="strategies",
+                        help="built-in name (%s) or module:Class; repeat for several" % ", ".join(hangman_strategies.STRATEGIES))
+    #same range as the guesses spinbox on SettingsPage
+    parser.add_argument("--guesses", type=int, default=hangman_engine.MIN_GUESSES,
+                        choices=range(hangman_engine.MIN_GUESSES, hangman_engine.MAX_GUESSES + 1), metavar="5-15")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    specs = args.strategies or list(hangman_strategies.STRATEGIES)
+    for spec in specs:
+        hangman_strategies.load_strategy(spec) #fail here on a bad name, not inside every worker
+    words = sorted(set(hangman_engine.read_word_list(args.words)))
+
+    start = time.perf_counter()
+    totals = run(words, specs, args.guesses, args.workers, args.chunk_size, print_progress(len(words), start))
+    print_report(totals)
+
+if __name__ == "__main__":
+    main()
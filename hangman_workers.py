@@ -0,0 +1,127 @@
+"""
+background work for the Tk window, so slow jobs (dictionary loads, solving, I/O) never run inside a Tk callback.
+
+submit() runs a function on a thread pool, or on a process pool for picklable CPU-bound jobs. finished results and
+progress reports go on a queue. the bridge drains that queue from the Tk thread with widget.after(), so on_done,
+on_error and on_progress always run on the UI thread. polling only runs while tasks are outstanding.
+
+tasks belong to a group (the page that started them). cancel_group() drops a group's pending work and discards any
+result still on its way. WindowMain does this when next_page() leaves the page.
+"""
+import concurrent.futures
+import os
+import queue
+
+DONE, PROGRESS = range(2)
+
+class Task:
+    """
+    handle for one submitted job. a thread job submitted with pass_task=True gets this as its task keyword argument,
+    so it can call report() and check cancelled.
+    """
+    __slots__ = ("bridge", "group", "future", "cancelled", "on_done", "on_error", "on_progress")
+
+    def __init__(self, bridge, group, on_done, on_error, on_progress):
+        self.bridge = bridge
+        self.group = group
+        self.future = None
+        self.cancelled = False
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+
+    def report(self, value):
+        """
+        - called from the worker. on_progress(value) runs later on the UI thread
+        """
+        if not self.cancelled:
+            self.bridge.results.put((self, PROGRESS, value))
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel() #only stops jobs that haven't started; running ones are ignored when they finish
+
+class WorkerBridge:
+    def __init__(self, widget, threads=2, processes=None, poll_ms=20):
+        self.widget = widget
+        self.threads = threads
+        self.processes = processes or os.cpu_count()
+        self.poll_ms = poll_ms
+        self.results = queue.Queue()
+        self.tasks = set()
+        self.poll_id = None
+        self.thread_pool = None #both pools are created on first use
+        self.process_pool = None
+
+    def submit(self, func, *args, group=None, on_done=None, on_error=None, on_progress=None, process=False, pass_task=False):
+        """
+        - runs func(*args) in the background and returns its Task. on_done(result) or on_error(exception) follows on the UI thread.
+        """
+        task = Task(self, group, on_done, on_error, on_progress)
+        if process:
+            if self.process_pool is None:
+                self.process_pool = concurrent.futures.ProcessPoolExecutor(self.processes)
+            task.future = self.process_pool.submit(func, *args)
+        else:
+            if self.thread_pool is None:
+                self.thread_pool = concurrent.futures.ThreadPoolExecutor(self.threads, thread_name_prefix="hangman-worker")
+            kwargs = {"task": task} if pass_task else {}
+            task.future = self.thread_pool.submit(func, *args, **kwargs)
+        self.tasks.add(task)
+        task.future.add_done_callback(lambda future: self.results.put((task, DONE, future)))
+        if self.poll_id is None:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+        return task
+
+    def busy(self, group=None):
+        return any(group is None or task.group == group for task in self.tasks)
+
+    def cancel_group(self, group):
+        for task in [task for task in self.tasks if task.group == group]:
+            task.cancel()
+            self.tasks.discard(task)
+
+    def poll(self):
+        """
+        - UI thread. hands finished results and progress to their callbacks, then polls again while work is outstanding.
+        """
+        self.poll_id = None
+        try:
+            while True:
+                try:
+                    task, kind, payload = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                if task.cancelled:
+                    continue
+                if kind == PROGRESS:
+                    if task.on_progress is not None:
+                        task.on_progress(payload)
+                    continue
+                self.tasks.discard(task)
+                if payload.cancelled():
+                    continue
+                error = payload.exception()
+                if error is None:
+                    if task.on_done is not None:
+                        task.on_done(payload.result())
+                elif task.on_error is not None:
+                    task.on_error(error)
+                else:
+                    raise error #shows up through Tk's usual callback error report
+        finally:
+            if self.tasks and self.poll_id is None:
+                self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def shutdown(self):
+        for task in list(self.tasks):
+            task.cancel()
+        self.tasks.clear()
+        if self.poll_id is not None:
+            self.widget.after_cancel(self.poll_id)
+            self.poll_id = None
+        for pool in (self.thread_pool, self.process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self.thread_pool = self.process_pool = None